@@ -0,0 +1,30 @@
+"""
+Gunicorn配置文件，用于在生产环境中运行日程表可视化服务
+
+使用方法：
+    gunicorn -c gunicorn_conf.py schedule_visualizer:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('TASKMATE_BIND', '0.0.0.0:5000')
+
+# 多进程 + 每个进程多线程，LLM查询等待网络时不会阻塞其他请求
+workers = int(os.environ.get('TASKMATE_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('TASKMATE_THREADS', 4))
+
+# 使用gevent工作进程（gunicorn -k gevent wsgi:app）时，每个进程可同时处理的连接数
+worker_connections = int(os.environ.get('TASKMATE_WORKER_CONNECTIONS', 1000))
+
+# LLM查询可能持续较长时间
+timeout = 120
+
+# 在主进程中预先加载应用，各工作进程通过写时复制共享已导入的模块
+preload_app = True
+
+def post_fork(server, worker):
+    """工作进程不能复用主进程中创建的SQLite连接，fork后重置线程本地连接"""
+    from schedule_visualizer import timetable_processor
+    timetable_processor.reset_connections()
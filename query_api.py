@@ -17,25 +17,12 @@ def get_api_config(model: str):
     else:  # OpenAI models
         return os.environ.get("OPENAI_API_KEY"), None
 
-def query_api(prompt, schedule, model="gpt-4-mini"):
-    """
-    向API发送查询并返回响应
-    
-    Args:
-        prompt (str): 发送给API的文本提示
-        schedule (str): 当前时间表
-        model (str): 使用的模型名称
-        
-    Returns:
-        str: 模型的响应文本
-    """
-    try:
-        api_key, base_url = get_api_config(model)
-        client = openai.OpenAI(api_key=api_key, base_url=base_url) if base_url else openai.OpenAI(api_key=api_key)
-        
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-        system_prompt = """您是一名专业的时间规划师，精通GTD工作法和敏捷项目管理。请根据用户提供的待办事项和现有时间表，完成以下任务："""
-        user_prompt = f"""
+# 系统提示词（角色说明）
+SYSTEM_PROMPT = """您是一名专业的时间规划师，精通GTD工作法和敏捷项目管理。请根据用户提供的待办事项和现有时间表，完成以下任务："""
+
+# 用户消息开头固定不变的处理规则和示例，动态内容（当前时间、时间表、新增任务）都接在其后，
+# 使每次请求的消息前缀完全相同，支持前缀缓存的服务（如DeepSeek、OpenAI）可以复用缓存
+PROMPT_RULES = """
 【处理规则】
 
 基本规则：
@@ -135,7 +122,21 @@ def query_api(prompt, schedule, model="gpt-4-mini"):
 
 请根据以上指令完成以下任务规划，并严格遵守输出格式，无需进行任何额外说明与解释：
 
-【输入】
+"""
+
+def build_messages(prompt, schedule):
+    """
+    构建发送给模型的消息列表
+    
+    Args:
+        prompt (str): 用户输入的待办事项
+        schedule (str): 当前时间表
+        
+    Returns:
+        list: 聊天消息列表
+    """
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    user_prompt = PROMPT_RULES + f"""【输入】
 当前时间：{current_time}
 
 当前时间表：
@@ -146,18 +147,77 @@ def query_api(prompt, schedule, model="gpt-4-mini"):
 
 【输出】
 """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def get_completion_params(model):
+    """
+    返回与模型相关的生成参数
+    
+    Args:
+        model (str): 模型名称
+    
+    Returns:
+        dict: 生成参数
+    """
+    return {
+        "stream": False,
+        "max_tokens": 1024,
+        "temperature": 0.2 if model.startswith("deepseek") else 0.5
+    }
+
+def query_api(prompt, schedule, model="gpt-4-mini"):
+    """
+    向API发送查询并返回响应
+    
+    Args:
+        prompt (str): 发送给API的文本提示
+        schedule (str): 当前时间表
+        model (str): 使用的模型名称
+    
+    Returns:
+        str: 模型的响应文本
+    """
+    try:
+        api_key, base_url = get_api_config(model)
+        client = openai.OpenAI(api_key=api_key, base_url=base_url) if base_url else openai.OpenAI(api_key=api_key)
+        
         response = client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            stream=False,
-            max_tokens=1024,
-            temperature=0.2 if model.startswith("deepseek") else 0.5
+            messages=build_messages(prompt, schedule),
+            **get_completion_params(model)
         )
 
         return response.choices[0].message.content
     
     except Exception as e:
-        return f"Error querying API: {str(e)}" 
\ No newline at end of file
+        return f"Error querying API: {str(e)}" 
+
+def query_api_stream(prompt, schedule, model="gpt-4-mini"):
+    """
+    以流式方式向API发送查询，逐段返回模型输出
+    
+    Args:
+        prompt (str): 发送给API的文本提示
+        schedule (str): 当前时间表
+        model (str): 使用的模型名称
+    
+    Yields:
+        str: 模型输出的文本片段
+    """
+    api_key, base_url = get_api_config(model)
+    client = openai.OpenAI(api_key=api_key, base_url=base_url) if base_url else openai.OpenAI(api_key=api_key)
+    
+    params = get_completion_params(model)
+    params["stream"] = True
+    stream = client.chat.completions.create(
+        model=model,
+        messages=build_messages(prompt, schedule),
+        **params
+    )
+    
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
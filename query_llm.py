@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import sys
 import time
 import argparse
+import logging
 from query_api import query_api
 from schedule_parser import TimetableProcessor
 
@@ -32,6 +34,10 @@ def query_llm():
     parser.add_argument('--limit', type=int, default=20, 
                         help='显示事件的最大数量')
     args = parser.parse_args()
+    
+    # 时间表处理器的日志（提取出的事件、处理进度等）输出到标准输出，与命令行的其他输出一起显示
+    logging.basicConfig(stream=sys.stdout, format='%(message)s')
+    logging.getLogger('taskmate').setLevel(logging.DEBUG)
 
     # 初始化时间表处理器
     processor = TimetableProcessor(database_type=args.db_type)
@@ -59,10 +65,6 @@ def query_llm():
     print("\n模型回复：")
     print(response)
     
-    # 获取修改前的所有事件（如果需要显示变更）
-    if args.show_changes:
-        old_events = processor.get_all_events(limit=args.limit)
-    
     # 处理事件并更新数据库
     try:
         if args.recurrence:
@@ -83,8 +85,7 @@ def query_llm():
             
         # 显示变更（如果需要）
         if args.show_changes:
-            new_events = processor.get_all_events(limit=args.limit)
-            changes = processor.format_events_with_changes(old_events, new_events, include_header=True, show_unchanged=args.show_unchanged)
+            changes = processor.format_events_from_delta(summary['changes'], include_header=True, show_unchanged=args.show_unchanged)
             print("\n事件变更：")
             print(changes)
         
@@ -2,10 +2,83 @@ import re
 import os
 import csv
 import sqlite3
+import threading
+import logging
 from datetime import datetime, timedelta, date
 import json
 
 
+logger = logging.getLogger('taskmate.parser')
+
+# 只保留当前月份（本地时间）事件的SQL过滤条件
+CURRENT_MONTH_SQL_FILTER = (
+    " AND date BETWEEN date('now', 'localtime', 'start of month')"
+    " AND date('now', 'localtime', 'start of month', '+1 month', '-1 day')"
+)
+
+# 前端使用的完成状态标志由SQLite在查询时直接生成（布尔值以0/1表示），
+# 不再在Python中逐个事件补充字段
+TIMETABLE_EVENT_COLUMNS = (
+    "id, title, date, time_range, COALESCE(event_type, '未知') AS event_type,"
+    " deadline, importance, recurrence_rule, last_updated, 'timetable' AS source,"
+    " 0 AS is_completed, 1 AS can_complete, 0 AS can_delete"
+)
+COMPLETED_EVENT_COLUMNS = (
+    "id, task_id, title, date, time_range, actual_time_range,"
+    " COALESCE(event_type, '未知') || ' (已完成)' AS event_type, deadline, importance,"
+    " completion_date, completion_notes, reflection_notes, 'completed_task' AS source,"
+    " 1 AS is_completed, 0 AS can_complete, 1 AS can_delete"
+)
+
+# 未完成事件与已完成事件通过 UNION ALL 一次查询时使用的列，两边对齐，缺少的字段为NULL
+TIMETABLE_UNION_COLUMNS = (
+    "id, NULL AS task_id, title, date, time_range, NULL AS actual_time_range,"
+    " COALESCE(event_type, '未知') AS event_type, deadline, importance, recurrence_rule,"
+    " last_updated, NULL AS completion_date, NULL AS completion_notes, NULL AS reflection_notes,"
+    " 'timetable' AS source, 0 AS is_completed, 1 AS can_complete, 0 AS can_delete"
+)
+COMPLETED_UNION_COLUMNS = (
+    "id, task_id, title, date, time_range, actual_time_range,"
+    " COALESCE(event_type, '未知') || ' (已完成)', deadline, importance, NULL,"
+    " NULL, completion_date, completion_notes, reflection_notes,"
+    " 'completed_task', 1, 0, 1"
+)
+
+# CSV模式下无法在查询中生成标志，读取后补充相同的字段
+UNKNOWN_EVENT_TYPE = '未知'
+COMPLETED_TYPE_SUFFIX = ' (已完成)'
+PENDING_EVENT_FLAGS = {'source': 'timetable', 'is_completed': 0, 'can_complete': 1, 'can_delete': 0}
+COMPLETED_EVENT_FLAGS = {'source': 'completed_task', 'is_completed': 1, 'can_complete': 0, 'can_delete': 1}
+
+
+class _PooledConnection:
+    """
+    Thin wrapper around a thread-local SQLite connection.
+    
+    close() rolls back any uncommitted transaction and returns the connection
+    to its thread's pool instead of closing it; everything else is delegated.
+    """
+    
+    def __init__(self, conn, local):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_local', local)
+        object.__setattr__(self, '_released', False)
+    
+    def close(self):
+        if self._released:
+            return
+        object.__setattr__(self, '_released', True)
+        if self._conn.in_transaction:
+            self._conn.rollback()
+        self._local.idle = self._conn
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
 class TimetableProcessor:
     """Process timetable information from LLM outputs and manage database operations."""
     
@@ -21,6 +94,11 @@ class TimetableProcessor:
         self.database_type = database_type.lower()
         self.db_path = db_path
         self.csv_path = csv_path
+        # 每个线程复用一个SQLite连接，避免每次调用都重新建立连接
+        self._local = threading.local()
+        # 只用于读取 PRAGMA data_version 的连接（每个进程一个），见 data_version()
+        self._version_conn = None
+        self._version_lock = threading.Lock()
         
         if self.database_type == "sqlite":
             self._init_sqlite()
@@ -31,9 +109,76 @@ class TimetableProcessor:
         else:
             raise ValueError("Unsupported database type. Use 'sqlite' or 'csv'.")
     
+    @staticmethod
+    def _current_month_range():
+        """返回当前月份第一天和最后一天的日期字符串（CSV模式下使用）"""
+        first_day = date.today().replace(day=1)
+        last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return first_day.isoformat(), last_day.isoformat()
+    
+    def _connect(self):
+        """
+        获取当前线程复用的SQLite连接。
+        
+        连接首次创建时开启WAL模式，使读操作不会被写操作阻塞。每次取出时重置
+        row_factory 和 isolation_level，调用方使用完毕后照常调用 close() 归还。
+        如果当前线程的连接正被外层调用使用，则返回一个独立的新连接。
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        local = self._local
+        conn = getattr(local, 'idle', None)
+        if conn is None:
+            if getattr(local, 'conn', None) is not None:
+                return self._open_connection()
+            conn = self._open_connection()
+            local.conn = conn
+        
+        local.idle = None
+        conn.row_factory = None
+        conn.isolation_level = ''
+        return _PooledConnection(conn, local)
+    
+    def _open_connection(self):
+        """
+        新建SQLite连接并设置连接级的PRAGMA。
+        
+        journal_mode=WAL 会保存在数据库文件中，synchronous 和 temp_store 只对当前连接有效，
+        因此嵌套调用时临时创建的独立连接也要设置。
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    def reset_connections(self):
+        """丢弃已复用的SQLite连接（例如在fork出的子进程中），之后的调用会重新建立连接"""
+        self._local = threading.local()
+        self._version_conn = None
+        self._version_lock = threading.Lock()
+    
+    def data_version(self):
+        """
+        返回数据库内容的版本号，任何连接（包括其他进程中的连接）提交修改后都会变化。
+        
+        PRAGMA data_version 只反映其他连接提交的修改，因此使用一个从不写入的专用连接读取，
+        本进程自己的修改也会反映出来。CSV存储没有版本号，返回None。
+        
+        Returns:
+            int or None: 数据版本号
+        """
+        if self.database_type != "sqlite":
+            return None
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+    
     def _init_sqlite(self):
         """Initialize SQLite database and create table if it doesn't exist."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Create table if it doesn't exist
@@ -85,6 +230,11 @@ class TimetableProcessor:
         # 检查并更新表结构
         self._check_and_update_table_structure(conn)
         
+        # 按日期范围查询事件时使用的索引。表结构迁移可能重建timetable表，索引在迁移之后创建
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_timetable_date_time ON timetable(date, time_range)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_completed_task_date ON completed_task(date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_completed_recurring_dates_date ON completed_recurring_dates(date)')
+        
         conn.commit()
         conn.close()
     
@@ -100,7 +250,7 @@ class TimetableProcessor:
             
         close_conn = False
         if conn is None:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             close_conn = True
             
         cursor = conn.cursor()
@@ -111,7 +261,7 @@ class TimetableProcessor:
         
         # 检查recurrence_rule列是否存在，如果不存在则添加
         if 'recurrence_rule' not in columns:
-            print("Adding recurrence_rule column to timetable")
+            logger.info("Adding recurrence_rule column to timetable")
             cursor.execute("ALTER TABLE timetable ADD COLUMN recurrence_rule TEXT")
             conn.commit()
         
@@ -121,17 +271,17 @@ class TimetableProcessor:
         
         # 检查actual_time_range列是否存在，如果不存在则添加
         if 'actual_time_range' not in completed_columns:
-            print("Adding actual_time_range column to completed_task")
+            logger.info("Adding actual_time_range column to completed_task")
             cursor.execute("ALTER TABLE completed_task ADD COLUMN actual_time_range TEXT")
             conn.commit()
         
         # 如果存在completed列，则迁移已完成的事件到completed_task表，然后删除该列
         if 'completed' in columns:
-            print("Migrating completed events to completed_task table")
+            logger.info("Migrating completed events to completed_task table")
             self._migrate_completed_events(conn)
             
             # SQLite不直接支持删除列，所以我们需要创建一个新表并迁移数据
-            print("Removing completed column from timetable")
+            logger.info("Removing completed column from timetable")
             cursor.execute('''
             CREATE TABLE timetable_new (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -236,10 +386,11 @@ class TimetableProcessor:
             }
             events.append(event)
         
-        # Debug info
-        print(f"Extracted {len(events)} events from LLM output")
-        for i, e in enumerate(events):
-            print(f"Event {i+1}: {e['title']} - {e['date']} - {e['action']}")
+        # Debug info（只在开启DEBUG级别时才逐个格式化事件）
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted %d events from LLM output", len(events))
+            for i, e in enumerate(events):
+                logger.debug("Event %d: %s - %s - %s", i + 1, e['title'], e['date'], e['action'])
         
         return events
     
@@ -255,7 +406,9 @@ class TimetableProcessor:
                 - 'force': Add events anyway, ignoring conflicts
             
         Returns:
-            dict: Summary of operations performed
+            dict: Summary of operations performed. 'changes' lists every applied change as
+                  {'op': 'add'|'mod'|'del', 'before': event or None, 'after': event or None},
+                  which format_events_from_delta turns into a change report
         """
         events = self.extract_events(llm_output)
         
@@ -266,7 +419,8 @@ class TimetableProcessor:
             'unchanged': 0,
             'skipped': 0,
             'errors': [],
-            'warnings': []
+            'warnings': [],
+            'changes': []
         }
         
         # First, collect all modifications so we can process them together
@@ -281,6 +435,7 @@ class TimetableProcessor:
             try:
                 self._delete_event(event)
                 summary['deleted'] += 1
+                summary['changes'].append({'op': 'del', 'before': event, 'after': None})
             except Exception as e:
                 summary['errors'].append(f"Error processing event '{event['title']}': {str(e)}")
         
@@ -355,6 +510,11 @@ class TimetableProcessor:
                 try:
                     self._modify_event(mod)
                     summary['modified'] += 1
+                    summary['changes'].append({
+                        'op': 'mod',
+                        'before': current_events_map.get(f"{mod['title']}|{mod['date']}"),
+                        'after': mod
+                    })
                 except Exception as e:
                     summary['errors'].append(f"Error processing event '{mod['title']}': {str(e)}")
         
@@ -432,6 +592,7 @@ class TimetableProcessor:
                 self._add_event_no_check(event)
                 event['processed'] = True  # Mark as processed for subsequent conflict checks
                 summary['added'] += 1
+                summary['changes'].append({'op': 'add', 'before': None, 'after': event})
                 
             except ValueError as ve:
                 if handle_conflicts == 'error':
@@ -459,7 +620,7 @@ class TimetableProcessor:
             dict: Summary of operation with count of removed duplicates
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Find duplicates (same title, date, time_range, and event_type)
@@ -541,7 +702,7 @@ class TimetableProcessor:
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -597,7 +758,7 @@ class TimetableProcessor:
             bool: True if exact duplicate exists, False otherwise
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -714,7 +875,7 @@ class TimetableProcessor:
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -764,7 +925,7 @@ class TimetableProcessor:
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # More flexible lookup - just use title and date, not time_range
@@ -872,7 +1033,7 @@ class TimetableProcessor:
     def _delete_event(self, event):
         """Delete an event from the database."""
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -916,7 +1077,69 @@ class TimetableProcessor:
                 writer = csv.writer(file)
                 writer.writerows(new_rows)
     
-    def get_all_events(self, date_from=None, date_to=None, limit=None, offset=0):
+    def _build_events_query(self, columns, date_from=None, date_to=None, limit=None, offset=0, current_month=False,
+                            include_completed=False):
+        """
+        构建查询未完成事件的SQL语句，已完成的周期性事件实例、日期范围和分页都在SQL中处理。
+        
+        Args:
+            columns (str): 要查询的列
+            date_from (str, optional): 开始日期，格式为'YYYY-MM-DD'
+            date_to (str, optional): 结束日期，格式为'YYYY-MM-DD'
+            limit (int, optional): 最大返回事件数
+            offset (int, optional): 跳过的事件数
+            current_month (bool): 为True且未提供日期范围时，只查询当前月份的事件
+            include_completed (bool): 为True时通过 UNION ALL 在同一条语句中查询同一范围内的已完成事件，
+                                      columns 应为 TIMETABLE_UNION_COLUMNS，结果中未完成事件排在前面
+        
+        Returns:
+            tuple: (query, params)
+        """
+        query = f'''
+        SELECT {columns} FROM timetable
+        WHERE NOT (
+            recurrence_rule IS NOT NULL AND TRIM(recurrence_rule) != ''
+            AND EXISTS (
+                SELECT 1 FROM completed_recurring_dates c
+                WHERE c.event_id = timetable.id AND c.date = timetable.date
+            )
+        )
+        '''
+        params = []
+        
+        # 添加日期范围过滤
+        if date_from:
+            query += ' AND date >= ?'
+            params.append(date_from)
+        if date_to:
+            query += ' AND date <= ?'
+            params.append(date_to)
+        if current_month and not date_from and not date_to:
+            query += CURRENT_MONTH_SQL_FILTER
+        
+        if include_completed:
+            query += f' UNION ALL SELECT {COMPLETED_UNION_COLUMNS} FROM completed_task WHERE 1=1'
+            if date_from:
+                query += ' AND date >= ?'
+                params.append(date_from)
+            if date_to:
+                query += ' AND date <= ?'
+                params.append(date_to)
+            if current_month and not date_from and not date_to:
+                query += CURRENT_MONTH_SQL_FILTER
+            query += ' ORDER BY is_completed, date, time_range'
+        else:
+            query += ' ORDER BY date, time_range'
+        
+        # 应用分页
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset or 0])
+        
+        return query, params
+    
+    def get_all_events(self, date_from=None, date_to=None, limit=None, offset=0, current_month=False,
+                       include_completed=False):
         """
         Retrieve events from the database with optional filtering and pagination.
         
@@ -925,87 +1148,34 @@ class TimetableProcessor:
             date_to (str, optional): End date in format 'YYYY-MM-DD'
             limit (int, optional): Maximum number of events to return
             offset (int, optional): Number of events to skip
+            current_month (bool): If True and no date range is given, only return
+                                  events in the current month
+            include_completed (bool): If True, completed events in the same range are
+                                      returned after the pending ones (one UNION ALL query
+                                      with SQLite); pagination covers both
             
         Returns:
             list: List of event dictionaries
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
-            # 获取所有事件
-            query = 'SELECT * FROM timetable'
-            params = []
-            
-            # 添加日期范围过滤
-            conditions = []
-            if date_from:
-                conditions.append('date >= ?')
-                params.append(date_from)
-            if date_to:
-                conditions.append('date <= ?')
-                params.append(date_to)
-            
-            if conditions:
-                query += ' WHERE ' + ' AND '.join(conditions)
-            
-            query += ' ORDER BY date, time_range'
-            
+            columns = TIMETABLE_UNION_COLUMNS if include_completed else TIMETABLE_EVENT_COLUMNS
+            query, params = self._build_events_query(
+                columns, date_from, date_to, limit, offset, current_month, include_completed
+            )
             cursor.execute(query, params)
-            events = [dict(row) for row in cursor.fetchall()]
-            
-            # 获取已完成的周期性事件日期
-            completed_query = '''
-            SELECT event_id, date FROM completed_recurring_dates
-            '''
-            if date_from or date_to:
-                completed_conditions = []
-                completed_params = []
-                
-                if date_from:
-                    completed_conditions.append('date >= ?')
-                    completed_params.append(date_from)
-                if date_to:
-                    completed_conditions.append('date <= ?')
-                    completed_params.append(date_to)
-                
-                if completed_conditions:
-                    completed_query += ' WHERE ' + ' AND '.join(completed_conditions)
-                
-                cursor.execute(completed_query, completed_params)
-            else:
-                cursor.execute(completed_query)
-            
-            # 创建一个集合来存储已完成的事件ID和日期对
-            completed_events = {(row[0], row[1]) for row in cursor.fetchall()}
-            
-            # 过滤掉已完成的周期性事件实例
-            filtered_events = []
-            for event in events:
-                event_id = event['id']
-                event_date = event['date']
-                is_recurring = event.get('recurrence_rule') and event['recurrence_rule'].strip() != ''
-                
-                # 如果不是周期性事件，或者是周期性事件但未完成，则保留
-                if not is_recurring or (event_id, event_date) not in completed_events:
-                    filtered_events.append(event)
-            
-            # 为每个事件添加source标志
-            for event in filtered_events:
-                event['source'] = 'timetable'
-            
-            # 应用分页
-            if limit is not None:
-                start_idx = offset
-                end_idx = offset + limit
-                filtered_events = filtered_events[start_idx:end_idx]
+            filtered_events = [dict(row) for row in cursor.fetchall()]
             
             conn.close()
             return filtered_events
         
         elif self.database_type == "csv":
             events = []
+            if current_month and not date_from and not date_to:
+                date_from, date_to = self._current_month_range()
             
             if os.path.exists(self.csv_path):
                 with open(self.csv_path, 'r', newline='', encoding='utf-8') as file:
@@ -1046,13 +1216,19 @@ class TimetableProcessor:
                 
                 # 如果不是周期性事件，或者是周期性事件但未完成，则保留
                 if not is_recurring or (event_id, event_date) not in completed_recurring_events:
-                    # 添加source标志
-                    event['source'] = 'timetable'
+                    # 添加source和完成状态标志
+                    event['event_type'] = event.get('event_type') or UNKNOWN_EVENT_TYPE
+                    event.update(PENDING_EVENT_FLAGS)
                     result_events.append(event)
             
             # 排序
             result_events.sort(key=lambda x: (x['date'], x['time_range']))
             
+            if include_completed:
+                completed_events = self.get_completed_events(date_from=date_from, date_to=date_to)
+                completed_events.sort(key=lambda x: (x['date'], x['time_range']))
+                result_events.extend(completed_events)
+            
             # 应用分页
             if limit is not None:
                 start_idx = offset
@@ -1083,6 +1259,77 @@ class TimetableProcessor:
             if len(batch) < batch_size:
                 break
     
+    def format_event_for_llm(self, event):
+        """
+        Format a single event in the format expected by the LLM.
+        
+        Args:
+            event (dict): Event dictionary (database or extracted event format)
+        
+        Returns:
+            str: Formatted event string
+        """
+        # Extract fields, handling both database and extracted event formats
+        title = event.get('title', '')
+        date = event.get('date', '')
+        time_range = event.get('time_range', '')
+        event_type = event.get('event_type', '')
+        deadline = event.get('deadline', '')
+        importance = event.get('importance', '')
+        
+        # Format each field on a new line
+        event_lines = [
+            f"事项: {title}",
+            f"日期: {date}",
+            f"时间段: {time_range}",
+            f"类型: {event_type}"
+        ]
+        
+        # Add optional fields if they exist
+        if deadline:
+            event_lines.append(f"截止日期：{deadline}")
+        
+        if importance:
+            event_lines.append(f"重要程度：{importance}")
+        
+        # Join the event lines with newlines
+        return "\n".join(event_lines)
+    
+    def iter_events_for_llm(self, date_from=None, date_to=None, limit=None, offset=0):
+        """
+        Yield events formatted for the LLM one at a time.
+        
+        With SQLite only the columns needed for the LLM context are read, and rows
+        are formatted as they come off the cursor instead of being collected into
+        a list of dictionaries first.
+        
+        Args:
+            date_from (str, optional): Start date in format 'YYYY-MM-DD'
+            date_to (str, optional): End date in format 'YYYY-MM-DD'
+            limit (int, optional): Maximum number of events to return
+            offset (int, optional): Number of events to skip
+        
+        Yields:
+            str: Formatted event string
+        """
+        if self.database_type != "sqlite":
+            events = self.get_all_events(date_from=date_from, date_to=date_to, limit=limit, offset=offset)
+            for event in sorted(events, key=lambda x: (str(x.get('date', '')), str(x.get('time_range', '')))):
+                yield self.format_event_for_llm(event)
+            return
+        
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            query, params = self._build_events_query(
+                'title, date, time_range, event_type, deadline, importance',
+                date_from, date_to, limit, offset
+            )
+            for row in conn.execute(query, params):
+                yield self.format_event_for_llm(dict(row))
+        finally:
+            conn.close()
+    
     def format_events_as_llm_output(self, events=None, include_header=False, date_from=None, date_to=None, limit=None, offset=0):
         """
         Format events as a string in the format expected by the LLM.
@@ -1098,43 +1345,18 @@ class TimetableProcessor:
         Returns:
             str: Formatted events string
         """
-        if events is None:
-            events = self.get_all_events(date_from=date_from, date_to=date_to, limit=limit, offset=offset)
-        
-        # Sort events by date and time
-        events = sorted(events, key=lambda x: (str(x.get('date', '')), str(x.get('time_range', ''))))
-        
         # Start building the output
         output = []
         if include_header:
             output.append("日程建议：")
         
-        for event in events:
-            # Extract fields, handling both database and extracted event formats
-            title = event.get('title', '')
-            date = event.get('date', '')
-            time_range = event.get('time_range', '')
-            event_type = event.get('event_type', '')
-            deadline = event.get('deadline', '')
-            importance = event.get('importance', '')
-            
-            # Format each field on a new line
-            event_lines = [
-                f"事项: {title}",
-                f"日期: {date}",
-                f"时间段: {time_range}",
-                f"类型: {event_type}"
-            ]
-            
-            # Add optional fields if they exist
-            if deadline:
-                event_lines.append(f"截止日期：{deadline}")
-            
-            if importance:
-                event_lines.append(f"重要程度：{importance}")
-            
-            # Join the event lines with newlines
-            output.append("\n".join(event_lines))
+        if events is None:
+            # 直接从数据库流式格式化，查询结果已按日期和时间排序
+            output.extend(self.iter_events_for_llm(date_from=date_from, date_to=date_to, limit=limit, offset=offset))
+        else:
+            # Sort events by date and time
+            events = sorted(events, key=lambda x: (str(x.get('date', '')), str(x.get('time_range', ''))))
+            output.extend(self.format_event_for_llm(event) for event in events)
         
         # Join all events with double newlines between them
         return "\n\n".join(output)
@@ -1152,14 +1374,14 @@ class TimetableProcessor:
             list: List of event dictionaries for the specified date
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
             # 首先获取当天的所有事件
-            cursor.execute('''
-            SELECT t.* FROM timetable t
-            WHERE t.date = ?
+            cursor.execute(f'''
+            SELECT {TIMETABLE_EVENT_COLUMNS} FROM timetable
+            WHERE date = ?
             ''', (date,))
             
             events = [dict(row) for row in cursor.fetchall()]
@@ -1178,10 +1400,6 @@ class TimetableProcessor:
             # 过滤掉已完成的周期性事件
             filtered_events = [event for event in events if event['id'] not in completed_recurring_event_ids]
             
-            # 为每个事件添加source标志
-            for event in filtered_events:
-                event['source'] = 'timetable'
-            
             # 应用分页
             if limit is not None:
                 start_idx = offset
@@ -1217,9 +1435,10 @@ class TimetableProcessor:
             
             filtered_events = sorted(filtered_events, key=lambda x: x['time_range'])
             
-            # 为每个事件添加source标志
+            # 添加source和完成状态标志
             for event in filtered_events:
-                event['source'] = 'timetable'
+                event['event_type'] = event.get('event_type') or UNKNOWN_EVENT_TYPE
+                event.update(PENDING_EVENT_FLAGS)
             
             # 应用分页
             if limit is not None:
@@ -1284,73 +1503,22 @@ class TimetableProcessor:
             
             if old_event and new_event:
                 # Check if event was modified
-                is_modified = False
-                changes = []
-                
-                # Compare each field
-                fields_to_check = [
-                    ('time_range', '时间段'),
-                    ('event_type', '类型'),
-                    ('deadline', '截止日期'),
-                    ('importance', '重要程度')
-                ]
-                
-                for field, field_name in fields_to_check:
-                    old_val = str(old_event.get(field, ''))
-                    new_val = str(new_event.get(field, ''))
-                    if old_val != new_val:
-                        is_modified = True
-                        changes.append(f"{field_name}: {old_val} → {new_val}")
-                
-                if is_modified:
+                changes = self._event_field_changes(old_event, new_event)
+                
+                if changes:
                     # Event was modified
-                    event_lines = [
-                        f"[*] 事项: {title} (已修改)",
-                        f"    日期: {date}",
-                    ]
-                    event_lines.extend(f"    {change}" for change in changes)
-                    changed_events.append("\n".join(event_lines))
+                    changed_events.append(self._format_modified_event(title, date, changes))
                 elif show_unchanged:
                     # Event unchanged, only show if show_unchanged is True
-                    event_lines = [
-                        f"[ ] 事项: {title}",
-                        f"    日期: {date}",
-                        f"    时间段: {new_event.get('time_range', '')}",
-                        f"    类型: {new_event.get('event_type', '')}"
-                    ]
-                    if new_event.get('deadline'):
-                        event_lines.append(f"    截止日期：{new_event['deadline']}")
-                    if new_event.get('importance'):
-                        event_lines.append(f"    重要程度：{new_event['importance']}")
-                    unchanged_events.append("\n".join(event_lines))
+                    unchanged_events.append(self._format_event_change('[ ]', title, date, new_event))
             
             elif new_event:
                 # New event added
-                event_lines = [
-                    f"[+] 事项: {title} (新增)",
-                    f"    日期: {date}",
-                    f"    时间段: {new_event.get('time_range', '')}",
-                    f"    类型: {new_event.get('event_type', '')}"
-                ]
-                if new_event.get('deadline'):
-                    event_lines.append(f"    截止日期：{new_event['deadline']}")
-                if new_event.get('importance'):
-                    event_lines.append(f"    重要程度：{new_event['importance']}")
-                changed_events.append("\n".join(event_lines))
+                changed_events.append(self._format_event_change('[+]', title, date, new_event, ' (新增)'))
             
             else:
                 # Event was deleted
-                event_lines = [
-                    f"[-] 事项: {title} (已删除)",
-                    f"    日期: {date}",
-                    f"    时间段: {old_event.get('time_range', '')}",
-                    f"    类型: {old_event.get('event_type', '')}"
-                ]
-                if old_event.get('deadline'):
-                    event_lines.append(f"    截止日期：{old_event['deadline']}")
-                if old_event.get('importance'):
-                    event_lines.append(f"    重要程度：{old_event['importance']}")
-                changed_events.append("\n".join(event_lines))
+                changed_events.append(self._format_event_change('[-]', title, date, old_event, ' (已删除)'))
         
         # 合并变更和未变更事件，优先显示变更事件
         all_formatted_events = changed_events + unchanged_events
@@ -1363,6 +1531,110 @@ class TimetableProcessor:
         output.extend(all_formatted_events)
         
         return "\n\n".join(output)
+    
+    def format_events_from_delta(self, changes, include_header=False, show_unchanged=False, limit=None):
+        """
+        根据 process_events / process_recurring_events 记录的变更列表生成变更明细，
+        输出格式与 format_events_with_changes 相同，但不需要在处理前后各读取一次全部事件。
+        
+        Args:
+            changes (list): 处理摘要中的 'changes' 列表
+            include_header (bool): 是否包含标题
+            show_unchanged (bool): 是否显示未变化的事件（此时会读取一次当前事件）
+            limit (int, optional): 最多显示的事件数
+        
+        Returns:
+            str: 带有 [+]、[-]、[*]、[ ] 标记的变更明细
+        """
+        output = []
+        if include_header:
+            output.append("日程变更明细：")
+            output.append("-" * 40)
+        
+        # 按日期和事项名称排序，与 format_events_with_changes 的顺序一致
+        def sort_key(change):
+            event = change['after'] or change['before']
+            return (str(event.get('date', '')), str(event.get('title', '')))
+        
+        changed_events = []
+        changed_keys = set()
+        for change in sorted(changes, key=sort_key):
+            event = change['after'] or change['before']
+            title, date = event.get('title', ''), event.get('date', '')
+            
+            if change['op'] == 'add':
+                changed_events.append(self._format_event_change('[+]', title, date, event, ' (新增)'))
+            elif change['op'] == 'del':
+                changed_events.append(self._format_event_change('[-]', title, date, event, ' (已删除)'))
+            else:
+                field_changes = self._event_field_changes(change['before'] or {}, change['after'])
+                if not field_changes:
+                    # 字段没有实际变化，按未变化事件处理
+                    continue
+                changed_events.append(self._format_modified_event(title, date, field_changes))
+            changed_keys.add((title, date))
+        
+        # 未变化的事件不在变更列表中，需要时只读取一次当前事件
+        unchanged_events = []
+        if show_unchanged:
+            current_events = {}
+            for event in self.get_all_events():
+                key = (event.get('title', ''), event.get('date', ''))
+                if key not in changed_keys:
+                    current_events[key] = event
+            for title, date in sorted(current_events, key=lambda x: (x[1], x[0])):
+                unchanged_events.append(self._format_event_change('[ ]', title, date, current_events[(title, date)]))
+        
+        # 合并变更和未变更事件，优先显示变更事件
+        all_formatted_events = changed_events + unchanged_events
+        if limit is not None and limit > 0:
+            all_formatted_events = all_formatted_events[:limit]
+        output.extend(all_formatted_events)
+        
+        return "\n\n".join(output)
+    
+    @staticmethod
+    def _event_field_changes(old_event, new_event):
+        """比较事件修改前后的字段，返回 "字段: 旧值 → 新值" 形式的变化列表"""
+        fields_to_check = [
+            ('time_range', '时间段'),
+            ('event_type', '类型'),
+            ('deadline', '截止日期'),
+            ('importance', '重要程度')
+        ]
+        
+        changes = []
+        for field, field_name in fields_to_check:
+            old_val = str(old_event.get(field, ''))
+            new_val = str(new_event.get(field, ''))
+            if old_val != new_val:
+                changes.append(f"{field_name}: {old_val} → {new_val}")
+        return changes
+    
+    @staticmethod
+    def _format_modified_event(title, date, changes):
+        """格式化被修改事件的变更明细"""
+        event_lines = [
+            f"[*] 事项: {title} (已修改)",
+            f"    日期: {date}",
+        ]
+        event_lines.extend(f"    {change}" for change in changes)
+        return "\n".join(event_lines)
+    
+    @staticmethod
+    def _format_event_change(marker, title, date, event, suffix=''):
+        """格式化新增、删除或未变化事件的变更明细"""
+        event_lines = [
+            f"{marker} 事项: {title}{suffix}",
+            f"    日期: {date}",
+            f"    时间段: {event.get('time_range', '')}",
+            f"    类型: {event.get('event_type', '')}"
+        ]
+        if event.get('deadline'):
+            event_lines.append(f"    截止日期：{event['deadline']}")
+        if event.get('importance'):
+            event_lines.append(f"    重要程度：{event['importance']}")
+        return "\n".join(event_lines)
 
     def delete_past_events(self, cutoff_time=None):
         """
@@ -1388,7 +1660,7 @@ class TimetableProcessor:
         deleted_events = []
 
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -1478,7 +1750,8 @@ class TimetableProcessor:
                 - 'force': Add events anyway, ignoring conflicts
             
         Returns:
-            dict: Summary of operations performed
+            dict: Summary of operations performed, with every added occurrence recorded in
+                  'changes' in the same form as process_events
         """
         events = self.extract_events(llm_output)
         
@@ -1486,7 +1759,8 @@ class TimetableProcessor:
             'added': 0,
             'skipped': 0,
             'errors': [],
-            'warnings': []
+            'warnings': [],
+            'changes': []
         }
         
         # Only process new events for recurrence
@@ -1525,6 +1799,7 @@ class TimetableProcessor:
                         if handle_conflicts == 'force':
                             self._add_event_no_check(occurrence_event)
                             summary['added'] += 1
+                            summary['changes'].append({'op': 'add', 'before': None, 'after': occurrence_event})
                         else:
                             # Check for conflicts
                             conflicts = self._check_time_conflict(occurrence_event)
@@ -1538,6 +1813,7 @@ class TimetableProcessor:
                             # No conflicts or force mode, add the event
                             self._add_event_no_check(occurrence_event)
                             summary['added'] += 1
+                            summary['changes'].append({'op': 'add', 'before': None, 'after': occurrence_event})
                     except ValueError as e:
                         if handle_conflicts == 'error':
                             # Re-raise the error to stop processing
@@ -1655,7 +1931,7 @@ class TimetableProcessor:
         original_event = None
         
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -1761,7 +2037,7 @@ class TimetableProcessor:
             # 更新原始事件的重复规则
             if self.database_type == "sqlite":
                 try:
-                    conn = sqlite3.connect(self.db_path)
+                    conn = self._connect()
                     cursor = conn.cursor()
                     
                     # 检查recurrence_rule列是否存在
@@ -1833,7 +2109,7 @@ class TimetableProcessor:
         recurring_events = []
         
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # 首先检查recurrence_rule列是否存在
@@ -1841,7 +2117,7 @@ class TimetableProcessor:
             columns = [column[1] for column in cursor.fetchall()]
             
             if 'recurrence_rule' not in columns:
-                print("Warning: recurrence_rule column does not exist in the database")
+                logger.warning("recurrence_rule column does not exist in the database")
                 conn.close()
                 return []
             
@@ -1866,10 +2142,10 @@ class TimetableProcessor:
                     }
                     recurring_events.append(event)
             except sqlite3.OperationalError as e:
-                print(f"Error querying recurring events: {e}")
+                logger.error("Error querying recurring events: %s", e)
                 # 尝试更新表结构
                 self._check_and_update_table_structure(conn)
-                print("Database structure has been updated. Please try again.")
+                logger.warning("Database structure has been updated. Please try again.")
                 
             conn.close()
             
@@ -1883,7 +2159,7 @@ class TimetableProcessor:
                 
                 # 检查CSV文件是否有recurrence_rule列
                 if len(header) <= 7 or header[7] != 'recurrence_rule':
-                    print("Warning: recurrence_rule column does not exist in the CSV file")
+                    logger.warning("recurrence_rule column does not exist in the CSV file")
                     return []
                 
                 for row in reader:
@@ -1913,7 +2189,7 @@ class TimetableProcessor:
             bool: True if successful, False otherwise
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # 首先检查recurrence_rule列是否存在
@@ -1921,7 +2197,7 @@ class TimetableProcessor:
             columns = [column[1] for column in cursor.fetchall()]
             
             if 'recurrence_rule' not in columns:
-                print("Warning: recurrence_rule column does not exist in the database")
+                logger.warning("recurrence_rule column does not exist in the database")
                 conn.close()
                 return False
             
@@ -1937,10 +2213,10 @@ class TimetableProcessor:
                 
                 return affected > 0
             except sqlite3.OperationalError as e:
-                print(f"Error removing recurrence: {e}")
+                logger.error("Error removing recurrence: %s", e)
                 # 尝试更新表结构
                 self._check_and_update_table_structure(conn)
-                print("Database structure has been updated. Please try again.")
+                logger.warning("Database structure has been updated. Please try again.")
                 conn.close()
                 return False
             
@@ -1958,7 +2234,7 @@ class TimetableProcessor:
                 # 检查CSV文件是否有recurrence_rule列
                 header = rows[0]
                 if len(header) <= 7 or header[7] != 'recurrence_rule':
-                    print("Warning: recurrence_rule column does not exist in the CSV file")
+                    logger.warning("recurrence_rule column does not exist in the CSV file")
                     return False
                 
             for i, row in enumerate(rows):
@@ -1992,13 +2268,13 @@ class TimetableProcessor:
         """
         if completed:
             # 如果标记为已完成，则移动到已完成任务表
-            print(f"标记事件 {event_id} 为已完成，日期: {event_date}")
+            logger.info("标记事件 %s 为已完成，日期: %s", event_id, event_date)
             return self.move_completed_event_to_history(event_id, completion_notes, reflection_notes, event_date, actual_time_range)
         else:
             # 如果标记为未完成，且事件已在已完成任务表中，则需要将其移回时间表
             # 这种情况在实际应用中可能较少发生，但为了完整性，我们也处理这种情况
             if self.database_type == "sqlite":
-                conn = sqlite3.connect(self.db_path)
+                conn = self._connect()
                 cursor = conn.cursor()
                 
                 try:
@@ -2056,7 +2332,7 @@ class TimetableProcessor:
                     conn.close()
                     return success
                 except Exception as e:
-                    print(f"Error marking event as not completed: {e}")
+                    logger.error("Error marking event as not completed: %s", e)
                     if conn:
                         conn.rollback()
                         conn.close()
@@ -2064,7 +2340,7 @@ class TimetableProcessor:
             elif self.database_type == "csv":
                 # 这里需要实现CSV版本的逻辑
                 # 由于CSV处理较为复杂，这里简化处理，仅返回False表示不支持
-                print("Marking event as not completed in CSV is not supported")
+                logger.warning("Marking event as not completed in CSV is not supported")
                 return False
     
     def move_completed_event_to_history(self, event_id, completion_notes=None, reflection_notes=None, event_date=None, actual_time_range=None):
@@ -2084,8 +2360,8 @@ class TimetableProcessor:
         if self.database_type == "sqlite":
             conn = None
             try:
-                print(f"开始处理事件 {event_id} 的完成操作，日期: {event_date}")
-                conn = sqlite3.connect(self.db_path)
+                logger.debug("开始处理事件 %s 的完成操作，日期: %s", event_id, event_date)
+                conn = self._connect()
                 # 开启事务，确保操作的原子性
                 conn.isolation_level = 'EXCLUSIVE'
                 cursor = conn.cursor()
@@ -2101,16 +2377,16 @@ class TimetableProcessor:
                 
                 task = cursor.fetchone()
                 if not task:
-                    print(f"在时间表中找不到事件 {event_id}")
+                    logger.warning("在时间表中找不到事件 %s", event_id)
                     conn.rollback()
                     return False
                 
-                print(f"找到事件 {event_id}: {task}")
+                logger.debug("找到事件 %s: %s", event_id, task)
                 title, date, time_range, event_type, deadline, importance, recurrence_rule = task
                 
                 # 如果提供了日期，则使用提供的日期覆盖查询结果
                 actual_date = event_date if event_date else date
-                print(f"使用日期: {actual_date} 处理事件")
+                logger.debug("使用日期: %s 处理事件", actual_date)
                 
                 # 确定是否为周期性事件
                 is_recurring = recurrence_rule is not None and recurrence_rule.strip() != ''
@@ -2123,7 +2399,7 @@ class TimetableProcessor:
                     ''', (event_id, actual_date))
                     
                     if cursor.fetchone():
-                        print(f"周期性事件 {event_id} 在日期 {actual_date} 已经标记为完成")
+                        logger.info("周期性事件 %s 在日期 %s 已经标记为完成", event_id, actual_date)
                         conn.commit()
                         return True
                 else:
@@ -2134,7 +2410,7 @@ class TimetableProcessor:
                     ''', (event_id, actual_date))
                     
                     if cursor.fetchone():
-                        print(f"事件 {event_id} 在日期 {actual_date} 已存在于已完成任务表中")
+                        logger.info("事件 %s 在日期 %s 已存在于已完成任务表中", event_id, actual_date)
                         conn.commit()
                         return True
                 
@@ -2146,7 +2422,7 @@ class TimetableProcessor:
                     VALUES (?, ?)
                     ''', (event_id, actual_date))
                     
-                    print(f"已记录周期性事件 {event_id} 在日期 {actual_date} 的完成状态")
+                    logger.debug("已记录周期性事件 %s 在日期 %s 的完成状态", event_id, actual_date)
                     
                     # 仍然需要在已完成任务表中添加一条记录
                     cursor.execute('''
@@ -2158,7 +2434,7 @@ class TimetableProcessor:
                         event_id, title, actual_date, time_range, actual_time_range, event_type, deadline, 
                         importance, completion_notes, reflection_notes
                     ))
-                    print(f"已将周期性事件 {event_id} 的完成记录添加到已完成任务表，日期 {actual_date}")
+                    logger.debug("已将周期性事件 %s 的完成记录添加到已完成任务表，日期 %s", event_id, actual_date)
                 else:
                     # 非周期性事件 - 从时间表中删除并添加到已完成任务表
                     cursor.execute('''
@@ -2170,43 +2446,43 @@ class TimetableProcessor:
                         event_id, title, actual_date, time_range, actual_time_range, event_type, deadline, 
                         importance, completion_notes, reflection_notes
                     ))
-                    print(f"已将事件 {event_id} 添加到已完成任务表，日期 {actual_date}")
+                    logger.debug("已将事件 %s 添加到已完成任务表，日期 %s", event_id, actual_date)
                     
                     # 从时间表中删除非周期性事件
                     cursor.execute('DELETE FROM timetable WHERE id = ?', (event_id,))
                     affected_rows = cursor.rowcount
-                    print(f"从时间表中删除事件 {event_id}，影响行数: {affected_rows}")
+                    logger.debug("从时间表中删除事件 %s，影响行数: %s", event_id, affected_rows)
                 
                 # 提交事务
                 conn.commit()
-                print(f"事件 {event_id} 的完成操作已成功提交")
+                logger.info("事件 %s 的完成操作已成功提交", event_id)
                 return True
                 
             except Exception as e:
-                print(f"移动事件 {event_id} 到已完成任务表时发生错误: {e}")
+                logger.error("移动事件 %s 到已完成任务表时发生错误: %s", event_id, e)
                 # 回滚事务
                 if conn:
                     try:
                         conn.rollback()
-                        print(f"事件 {event_id} 的完成操作已回滚")
+                        logger.warning("事件 %s 的完成操作已回滚", event_id)
                     except Exception as rollback_error:
-                        print(f"回滚事务时发生错误: {rollback_error}")
+                        logger.error("回滚事务时发生错误: %s", rollback_error)
                 return False
             finally:
                 # 确保连接关闭
                 if conn:
                     try:
                         conn.close()
-                        print(f"事件 {event_id} 的数据库连接已关闭")
+                        logger.debug("事件 %s 的数据库连接已关闭", event_id)
                     except Exception as close_error:
-                        print(f"关闭数据库连接时发生错误: {close_error}")
+                        logger.error("关闭数据库连接时发生错误: %s", close_error)
         
         elif self.database_type == "csv":
-            print(f"开始处理CSV事件 {event_id} 的完成操作")
+            logger.debug("开始处理CSV事件 %s 的完成操作", event_id)
             try:
                 # 读取事件详情
                 if not os.path.exists(self.csv_path):
-                    print(f"CSV文件 {self.csv_path} 不存在")
+                    logger.warning("CSV文件 %s 不存在", self.csv_path)
                     return False
                 
                 events = []
@@ -2224,16 +2500,16 @@ class TimetableProcessor:
                             
                             # 对于周期性事件，保留原事件
                             if is_recurring:
-                                print(f"CSV事件 {event_id} 是周期性事件，保留原事件")
+                                logger.debug("CSV事件 %s 是周期性事件，保留原事件", event_id)
                                 events.append(row)
                             else:
-                                print(f"CSV事件 {event_id} 不是周期性事件，从时间表中删除")
+                                logger.debug("CSV事件 %s 不是周期性事件，从时间表中删除", event_id)
                                 # 不添加到events列表，相当于删除
                         else:
                             events.append(row)
                 
                 if not completed_event:
-                    print(f"在CSV时间表中找不到事件 {event_id}")
+                    logger.warning("在CSV时间表中找不到事件 %s", event_id)
                     return False
                 
                 # 使用提供的日期覆盖原始日期
@@ -2260,7 +2536,7 @@ class TimetableProcessor:
                                     break
                         
                         if already_completed:
-                            print(f"周期性事件 {event_id} 在日期 {actual_date} 已经标记为完成")
+                            logger.info("周期性事件 %s 在日期 %s 已经标记为完成", event_id, actual_date)
                             return True
                     
                     # 添加完成记录
@@ -2277,7 +2553,7 @@ class TimetableProcessor:
                             'completion_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                         })
                     
-                    print(f"已记录周期性事件 {event_id} 在日期 {actual_date} 的完成状态")
+                    logger.debug("已记录周期性事件 %s 在日期 %s 的完成状态", event_id, actual_date)
                 
                 # 无论是否为周期性事件，都添加到已完成任务表
                 if not is_recurring:
@@ -2286,7 +2562,7 @@ class TimetableProcessor:
                         writer = csv.DictWriter(file, fieldnames=fieldnames)
                         writer.writeheader()
                         writer.writerows(events)
-                    print(f"已更新CSV时间表，{'保留' if is_recurring else '删除'}事件 {event_id}")
+                    logger.debug("已更新CSV时间表，%s事件 %s", '保留' if is_recurring else '删除', event_id)
                 
                 # 添加到已完成任务CSV
                 completed_task_path = os.path.splitext(self.csv_path)[0] + '_completed.csv'
@@ -2303,7 +2579,7 @@ class TimetableProcessor:
                         for row in reader:
                             if row.get('task_id') == str(event_id) and row.get('date') == actual_date:
                                 existing_completed = True
-                                print(f"事件 {event_id} 在日期 {actual_date} 已存在于已完成任务表中")
+                                logger.info("事件 %s 在日期 %s 已存在于已完成任务表中", event_id, actual_date)
                                 break
                     
                     if existing_completed:
@@ -2326,11 +2602,11 @@ class TimetableProcessor:
                     # 使用实际日期
                     completed_event['date'] = actual_date
                     writer.writerow(completed_event)
-                print(f"已将事件 {event_id} 添加到已完成任务表，日期 {actual_date}")
+                logger.info("已将事件 %s 添加到已完成任务表，日期 %s", event_id, actual_date)
                 
                 return True
             except Exception as e:
-                print(f"处理CSV事件 {event_id} 时发生错误: {e}")
+                logger.error("处理CSV事件 %s 时发生错误: %s", event_id, e)
                 return False
     
     def _remove_event_from_csv(self, event_id):
@@ -2370,7 +2646,80 @@ class TimetableProcessor:
                 
         return found
     
-    def get_completed_events(self, date_from=None, date_to=None, limit=None, offset=0):
+    def get_events_grouped_by_date(self, date_from, date_to):
+        """
+        获取日期范围内的未完成事件和已完成事件，并按日期分组。
+        
+        SQLite下分组和JSON构造都由 GROUP BY 与 json_group_array 在数据库中完成。
+        
+        Args:
+            date_from (str): 开始日期，格式为'YYYY-MM-DD'
+            date_to (str): 结束日期，格式为'YYYY-MM-DD'
+        
+        Returns:
+            dict: 以日期为键的字典，值为包含 'pending' 和 'completed' 两个事件列表的字典
+        """
+        grouped = {}
+        
+        if self.database_type == "sqlite":
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            # 未完成事件（排除已完成的周期性事件实例）
+            cursor.execute('''
+            SELECT date, json_group_array(json_object(
+                'id', id, 'title', title, 'date', date, 'time_range', time_range,
+                'event_type', COALESCE(event_type, '未知'), 'deadline', deadline, 'importance', importance,
+                'recurrence_rule', recurrence_rule, 'last_updated', last_updated,
+                'source', 'timetable', 'is_completed', 0, 'can_complete', 1, 'can_delete', 0
+            ))
+            FROM (
+                SELECT * FROM timetable
+                WHERE date >= ? AND date <= ?
+                AND NOT (
+                    recurrence_rule IS NOT NULL AND TRIM(recurrence_rule) != ''
+                    AND EXISTS (
+                        SELECT 1 FROM completed_recurring_dates c
+                        WHERE c.event_id = timetable.id AND c.date = timetable.date
+                    )
+                )
+                ORDER BY date, time_range
+            )
+            GROUP BY date
+            ''', (date_from, date_to))
+            for day, events_json in cursor.fetchall():
+                grouped.setdefault(day, {'pending': [], 'completed': []})['pending'] = json.loads(events_json)
+            
+            # 已完成事件
+            cursor.execute('''
+            SELECT date, json_group_array(json_object(
+                'id', id, 'task_id', task_id, 'title', title, 'date', date,
+                'time_range', time_range, 'actual_time_range', actual_time_range,
+                'event_type', COALESCE(event_type, '未知') || ' (已完成)', 'deadline', deadline,
+                'importance', importance, 'completion_date', completion_date,
+                'completion_notes', completion_notes, 'reflection_notes', reflection_notes,
+                'source', 'completed_task', 'is_completed', 1, 'can_complete', 0, 'can_delete', 1
+            ))
+            FROM (
+                SELECT * FROM completed_task
+                WHERE date >= ? AND date <= ?
+                ORDER BY completion_date DESC
+            )
+            GROUP BY date
+            ''', (date_from, date_to))
+            for day, events_json in cursor.fetchall():
+                grouped.setdefault(day, {'pending': [], 'completed': []})['completed'] = json.loads(events_json)
+            
+            conn.close()
+        else:
+            for event in self.get_all_events(date_from=date_from, date_to=date_to):
+                grouped.setdefault(event['date'], {'pending': [], 'completed': []})['pending'].append(event)
+            for event in self.get_completed_events(date_from=date_from, date_to=date_to):
+                grouped.setdefault(event['date'], {'pending': [], 'completed': []})['completed'].append(event)
+        
+        return grouped
+    
+    def get_completed_events(self, date_from=None, date_to=None, limit=None, offset=0, current_month=False):
         """
         获取已完成的事件。
         
@@ -2379,18 +2728,23 @@ class TimetableProcessor:
             date_to (str, optional): 结束日期，格式为'YYYY-MM-DD'
             limit (int, optional): 最大返回事件数
             offset (int, optional): 跳过的事件数
+            current_month (bool): 为True且未提供日期范围时，只返回当前月份的事件
         
         Returns:
-            list: 已完成事件列表，每个事件都添加了source='completed_task'标志
+            list: 已完成事件列表，每个事件都带有source='completed_task'和完成状态标志
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
-            query = 'SELECT * FROM completed_task'
+            query = f'SELECT {COMPLETED_EVENT_COLUMNS} FROM completed_task'
             params = []
             
+            # 未提供日期范围时，由SQLite计算当前月份的范围
+            if current_month and not date_from and not date_to:
+                query += ' WHERE 1=1' + CURRENT_MONTH_SQL_FILTER
+            
             # 添加日期范围过滤
             if date_from or date_to:
                 query += ' WHERE 1=1'
@@ -2418,16 +2772,12 @@ class TimetableProcessor:
             cursor.execute(query, params)
             events = [dict(row) for row in cursor.fetchall()]
             
-            # 为每个事件添加source标志
-            for event in events:
-                event['source'] = 'completed_task'
-                # 确保id字段存在（前端可能依赖此字段）
-                if 'id' not in event and 'task_id' in event:
-                    event['id'] = event['task_id']
-            
             conn.close()
             return events
         elif self.database_type == "csv":
+            if current_month and not date_from and not date_to:
+                date_from, date_to = self._current_month_range()
+            
             # 读取已完成任务CSV
             completed_task_path = os.path.splitext(self.csv_path)[0] + '_completed.csv'
             if not os.path.exists(completed_task_path):
@@ -2436,6 +2786,9 @@ class TimetableProcessor:
             events = []
             with open(completed_task_path, 'r', newline='', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
+                # 每行的字段都来自表头，是否需要补充id字段只需判断一次
+                fieldnames = reader.fieldnames or []
+                copy_task_id = 'id' not in fieldnames and 'task_id' in fieldnames
                 for row in reader:
                     # 日期范围过滤
                     if date_from and row['date'] < date_from:
@@ -2443,10 +2796,11 @@ class TimetableProcessor:
                     if date_to and row['date'] > date_to:
                         continue
                     
-                    # 添加source标志
-                    row['source'] = 'completed_task'
+                    # 添加source和完成状态标志
+                    row['event_type'] = (row.get('event_type') or UNKNOWN_EVENT_TYPE) + COMPLETED_TYPE_SUFFIX
+                    row.update(COMPLETED_EVENT_FLAGS)
                     # 确保id字段存在
-                    if 'id' not in row and 'task_id' in row:
+                    if copy_task_id:
                         row['id'] = row['task_id']
                         
                     events.append(row)
@@ -2490,7 +2844,7 @@ class TimetableProcessor:
             bool: 操作是否成功
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             try:
@@ -2507,7 +2861,7 @@ class TimetableProcessor:
                 return success
                 
             except Exception as e:
-                print(f"Error adding reflection notes: {e}")
+                logger.error("Error adding reflection notes: %s", e)
                 conn.close()
                 return False
                 
@@ -2525,7 +2879,7 @@ class TimetableProcessor:
             list: 历史记录列表
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -2578,7 +2932,7 @@ class TimetableProcessor:
             dict: 任务的复盘记录
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -2608,7 +2962,7 @@ class TimetableProcessor:
             bool: 操作是否成功
         """
         if self.database_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             try:
@@ -2639,11 +2993,11 @@ class TimetableProcessor:
                     # 如果是周期性事件的已完成实例，只删除完成记录
                     cursor.execute('DELETE FROM completed_recurring_dates WHERE event_id = ? AND date = ?', 
                                   (task_id, task_date))
-                    print(f"已删除周期性事件 {task_id} 在日期 {task_date} 的完成记录")
+                    logger.debug("已删除周期性事件 %s 在日期 %s 的完成记录", task_id, task_date)
                 
                 # 从已完成任务表中删除
                 cursor.execute('DELETE FROM completed_task WHERE task_id = ? OR id = ?', (task_id, task_id))
-                print(f"已从已完成任务表中删除任务 {task_id}")
+                logger.info("已从已完成任务表中删除任务 %s", task_id)
                 
                 conn.commit()
                 success = True
@@ -2651,7 +3005,7 @@ class TimetableProcessor:
                 return success
                 
             except Exception as e:
-                print(f"删除已完成任务时发生错误: {e}")
+                logger.error("删除已完成任务时发生错误: %s", e)
                 if conn:
                     conn.rollback()
                     conn.close()
@@ -2719,5 +3073,5 @@ class TimetableProcessor:
                 
                 return True
             except Exception as e:
-                print(f"删除CSV已完成任务时发生错误: {e}")
+                logger.error("删除CSV已完成任务时发生错误: %s", e)
                 return False
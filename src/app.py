@@ -5,6 +5,7 @@
 import os
 import sys
 from flask import Flask
+from flask_compress import Compress
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
@@ -42,6 +43,15 @@ class App:
                               template_folder=os.path.abspath(templates_dir),
                               static_folder=os.path.abspath(static_dir))
         self.flask_app.config['TEMPLATES_AUTO_RELOAD'] = True
+        # 静态资源允许浏览器缓存一小时，文本响应使用br/gzip压缩
+        self.flask_app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+        self.flask_app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+        self.flask_app.config['COMPRESS_MIN_SIZE'] = 1024
+        self.flask_app.config['COMPRESS_MIMETYPES'] = [
+            'application/json', 'text/html', 'text/css', 'text/javascript', 'application/javascript'
+        ]
+        self.flask_app.config['COMPRESS_LEVEL'] = 5
+        Compress(self.flask_app)
         
         # 创建事件处理器
         self.event_processor = EventProcessor(database_type, db_path, csv_path)
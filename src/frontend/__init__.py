@@ -1,3 +1,27 @@
 """
 前端生成模块
-""" 
\ No newline at end of file
+"""
+
+def write_if_changed(path, content):
+    """
+    写入生成的文件，内容与磁盘上已有的文件相同时跳过写入
+    
+    文件修改时间因此保持不变，按修改时间缓存的静态资源版本号和主页渲染结果继续有效
+    
+    Args:
+        path (str): 文件路径
+        content (str): 文件内容
+        
+    Returns:
+        bool: 是否写入了文件
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
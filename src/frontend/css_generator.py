@@ -4,6 +4,8 @@ CSS生成器模块，负责生成CSS样式文件
 
 import os
 
+from src.frontend import write_if_changed
+
 class CSSGenerator:
     """CSS生成器，负责生成CSS样式文件"""
     
@@ -555,9 +557,8 @@ footer {
 }
 """
         
-        # 写入文件
-        with open(os.path.join(self.css_dir, 'style.css'), 'w', encoding='utf-8') as f:
-            f.write(css)
+        # 写入文件（内容未变化时跳过）
+        write_if_changed(os.path.join(self.css_dir, 'style.css'), css)
     
     def create_all_css(self):
         """创建所有CSS样式文件"""
@@ -4,6 +4,8 @@ HTML模板生成器模块，负责生成HTML模板
 
 import os
 
+from src.frontend import write_if_changed
+
 class HTMLGenerator:
     """HTML模板生成器，负责生成HTML模板"""
     
@@ -199,9 +201,8 @@ class HTMLGenerator:
 </html>
 """
         
-        # 写入文件
-        with open(os.path.join(self.templates_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(index_html)
+        # 写入文件（内容未变化时跳过）
+        write_if_changed(os.path.join(self.templates_dir, 'index.html'), index_html)
     
     def create_all_templates(self):
         """创建所有HTML模板"""
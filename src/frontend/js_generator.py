@@ -8,6 +8,7 @@ import sys
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
+from src.frontend import write_if_changed
 from src.frontend.js_generator_base import JSGeneratorBase
 from src.frontend.js_generator_advanced import JSGeneratorAdvanced
 
@@ -50,9 +51,8 @@ class JSGenerator:
             # 组合JavaScript文件
             combined_js = base_js + "\n\n" + advanced_js
             
-            # 写入组合的JavaScript文件
-            with open(os.path.join(self.js_dir, 'script.js'), 'w', encoding='utf-8') as f:
-                f.write(combined_js)
+            # 写入组合的JavaScript文件（内容未变化时跳过）
+            write_if_changed(os.path.join(self.js_dir, 'script.js'), combined_js)
             
             # 删除临时文件
             try:
@@ -8,10 +8,6 @@ import sys
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
-from src.frontend.html_generator import HTMLGenerator
-from src.frontend.css_generator import CSSGenerator
-from src.frontend.js_generator import JSGenerator
-
 class TemplateGenerator:
     """模板生成器，负责组合HTML、CSS和JavaScript生成器"""
     
@@ -25,9 +21,6 @@ class TemplateGenerator:
         """
         self.templates_dir = templates_dir
         self.static_dir = static_dir
-        self.html_generator = HTMLGenerator(templates_dir)
-        self.css_generator = CSSGenerator(static_dir)
-        self.js_generator = JSGenerator(static_dir)
     
     def ensure_directories(self):
         """确保必要的目录存在"""
@@ -49,19 +42,42 @@ class TemplateGenerator:
         if not os.path.exists(js_dir):
             os.makedirs(js_dir)
     
-    def create_all_templates(self):
-        """创建所有模板和静态资源"""
+    def templates_exist(self):
+        """检查模板和静态资源是否都已存在"""
+        paths = [
+            os.path.join(self.templates_dir, 'index.html'),
+            os.path.join(self.static_dir, 'css', 'style.css'),
+            os.path.join(self.static_dir, 'js', 'script.js'),
+        ]
+        return all(os.path.exists(path) for path in paths)
+    
+    def create_all_templates(self, force=False):
+        """
+        创建所有模板和静态资源
+        
+        Args:
+            force (bool): 为True时即使文件已存在也重新生成
+        """
+        if not force and self.templates_exist():
+            print("模板和静态资源已存在，跳过生成")
+            return "模板和静态资源已存在，跳过生成"
+        
         self.ensure_directories()
         
         try:
+            # 生成器模块包含大量字符串常量，只在确实需要生成文件时才导入
+            from src.frontend.html_generator import HTMLGenerator
+            from src.frontend.css_generator import CSSGenerator
+            from src.frontend.js_generator import JSGenerator
+            
             # 创建HTML模板
-            self.html_generator.create_all_templates()
+            HTMLGenerator(self.templates_dir).create_all_templates()
             
             # 创建CSS样式
-            self.css_generator.create_all_css()
+            CSSGenerator(self.static_dir).create_all_css()
             
             # 创建JavaScript功能
-            self.js_generator.create_all_js()
+            JSGenerator(self.static_dir).create_all_js()
             
             print("所有模板和静态资源已创建完成")
             return "所有模板和静态资源已创建完成"
@@ -0,0 +1,107 @@
+// LLM查询Worker：在后台线程中发送请求并解析Server-Sent Events响应，
+// 模型输出片段和最终结果通过结构化克隆传回主线程。
+// 服务器逐项推送处理结果（part事件），在done事件时合并为完整结果
+
+// 请求体超过该长度时使用gzip压缩后再发送
+const GZIP_THRESHOLD = 2048;
+
+// 是否已收到包含最终结果的done事件
+let receivedDone = false;
+// 已收到的各部分处理结果
+let result = {};
+
+self.onmessage = async function(e) {
+    receivedDone = false;
+    result = {};
+    try {
+        const json = JSON.stringify(e.data.body);
+        const headers = {
+            'Content-Type': 'application/json'
+        };
+        let body = json;
+        
+        if (json.length > GZIP_THRESHOLD && typeof CompressionStream !== 'undefined') {
+            const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+            body = await new Response(stream).blob();
+            headers['Content-Encoding'] = 'gzip';
+        }
+        
+        const response = await fetch(e.data.url, {
+            method: 'POST',
+            headers: headers,
+            body: body
+        });
+        
+        // 请求被拒绝（如请求体无效）时返回的不是事件流，把服务器给出的错误信息转给主线程
+        if (!response.ok) {
+            self.postMessage({ type: 'error', message: await responseErrorMessage(response) });
+            return;
+        }
+        
+        // 逐块读取事件流，按空行切分出完整的事件
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                handleServerEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
+        
+        if (!receivedDone) {
+            self.postMessage({ type: 'error', message: '响应在返回最终结果前中断' });
+        }
+    } catch (error) {
+        self.postMessage({ type: 'error', message: error.message });
+    }
+};
+
+// 解析单个事件并转发给主线程
+function handleServerEvent(rawEvent) {
+    let eventName = 'message';
+    let data = '';
+    rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            eventName = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data += line.slice(5).trim();
+        }
+    });
+    
+    if (!data) return;
+    let payload;
+    try {
+        payload = JSON.parse(data);
+    } catch (error) {
+        // 抛出的错误由onmessage捕获并转给主线程
+        throw new Error('无法解析服务器返回的数据: ' + error.message);
+    }
+    
+    if (eventName === 'part') {
+        Object.assign(result, payload);
+    } else if (eventName === 'done') {
+        receivedDone = true;
+        self.postMessage({ type: 'done', data: Object.assign(result, payload) });
+    } else {
+        self.postMessage({ type: 'token', token: payload.token });
+    }
+}
+
+// 从失败的响应中取出带状态码的错误信息：JSON响应使用其中的message或error字段，
+// 其他响应（如HTML错误页）去掉标题和标签后使用正文
+async function responseErrorMessage(response) {
+    const text = await response.text().catch(() => '');
+    let message = '';
+    try {
+        const data = JSON.parse(text);
+        message = data.message || data.error || '';
+    } catch (error) {
+        message = text.replace(/<title>[\s\S]*?<\/title>/i, '').replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim();
+    }
+    return `HTTP ${response.status}${message ? ': ' + message : ''}`;
+}
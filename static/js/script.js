@@ -3,91 +3,190 @@
 let currentDate = new Date();
 let currentView = 'month'; // 当前视图类型：month, week, day, list
 let events = [];
+// 按日期分组的事件，每组按开始时间排序，每次加载数据后建立一次，供各视图按日期直接查找
+let eventsByDate = {};
+// 按日期分组的跨天事件，周视图和日视图显示前一天跨到当天的部分时只需遍历这些事件
+let overnightEventsByDate = {};
+// 日历视图（月、周、日、列表）中的事件，按eventKey索引，供事件委托查找
+const calendarEventMap = new Map();
+// 上一次渲染的视图及日期范围、当前视图中事件的放置方式，以及已放置事件的节点，
+// 用于同一视图内刷新数据时只更新发生变化的事件
+let lastRendered = null;
+let currentViewPlan = null;
+const renderedEventNodes = new Map();
 
-// 用于跟踪正在处理的事件ID
-let processingEvents = new Set();
-// 用于跟踪已处理完成的事件ID，防止重复处理
-let completedEvents = new Set();
+// 完成、删除操作的处理状态直接记录在事件对象的 _status 字段上：
+// 'processing' 表示请求正在进行，'completed' 表示已处理完成，未设置表示空闲。
+// 重新加载数据后事件对象被替换，状态随之清空
 
-// 用于存储当前正在完成的事件信息
+// 当前正在完成（完成任务对话框中）的事件
 let currentCompletingEvent = null;
 
-// 用于跟踪加载状态
-let isLoadingEvents = false;
+// 当前详情面板中显示的事件
+let detailsEvent = null;
+// 已完成视图中渲染的事件，按ID索引，供事件委托查找
+const completedEventMap = new Map();
+// 已完成视图中用于按需生成日期分组的观察器
+let completedGroupObserver = null;
+// 已完成视图中的日期分组节点及其事件数据，按日期索引，用于增量更新
+const completedDateGroupNodes = new Map();
+let completedEventsByDate = {};
+
+// 事件数据加载失败后的重试次数；是否有请求正在进行由 loadEventsController 表示
 let loadEventsRetryCount = 0;
 const MAX_RETRY_COUNT = 3;
+// 当前事件数据请求的控制器，以及延迟加载和重试的计时器
+let loadEventsController = null;
+// 每次加载递增的序号，只有最新一次加载的结果会被采用
+let loadEventsToken = 0;
+let loadEventsTimer = null;
+let loadEventsRetryTimer = null;
+const LOAD_EVENTS_DEBOUNCE_MS = 150;
+// 最近加载过的事件数据，按请求URL索引（最近使用的在最后），TTL内直接复用，
+// 过期后带上ETag重新验证。事件被修改后整体清空
+const EVENTS_CACHE_TTL_MS = 30000;
+const EVENTS_CACHE_MAX = 20;
+const eventsResponseCache = new Map();
+// 已计算过布局和分组的事件数据（接口返回的原始数据 -> {events, index}）
+const preparedEventData = new WeakMap();
+// 已安排但尚未执行的渲染帧和日期显示更新帧
+let renderFrame = null;
+let dateDisplayFrame = null;
+// 不支持Web Worker时轮询后台LLM查询任务的间隔
+const LLM_POLL_INTERVAL_MS = 1000;
+
+// 列表视图虚拟滚动：只渲染可见区域附近的行，行节点循环复用
+const LIST_DATE_ROW_HEIGHT = 44;
+const LIST_EVENT_ROW_HEIGHT = 44;
+const LIST_BUFFER_PX = 300;
+let listRows = [];
+let listRowOffsets = [];
+let listRowPool = [];
+let listViewport = null;
+let listScrollFrame = null;
+
+// 周视图和日视图只放置与可见时间段（含上下缓冲）相交的事件，滚动时在下一帧更新
+const TIME_GRID_BUFFER_PX = 200;
+let timeGridScrollFrame = null;
+// 从视图中移除的事件项节点，生成新的事件项时优先复用
+const EVENT_ITEM_POOL_MAX = 200;
+const eventItemPool = [];
+// 按时间段缓存解析得到的时间轴位置，按事件类型缓存事件项的颜色样式，切换视图或重新加载数据时直接复用
+const EVENT_LAYOUT_CACHE_MAX = 1000;
+const eventLayoutCache = new Map();
+// 时间回顾中计划和实际时间段的解析结果，按时间段字符串缓存
+const reviewTimeRangeCache = new Map();
+const eventTypeStyleCache = new Map();
+// 各事件类型的背景色和左边框颜色，通过 --ev-bg、--ev-fg 变量写入事件项，其余类型不设置颜色
+const EVENT_TYPE_COLORS = Object.freeze({
+    meeting: ['#bbdefb', '#2196F3'],
+    task: ['#c8e6c9', '#4CAF50'],
+    deadline: ['#ffcdd2', '#F44336'],
+    other: ['#e1bee7', '#9C27B0']
+});
+
+// 常用DOM元素的缓存，在DOMContentLoaded时填充。
+// 通过setTextOffDom整体替换的元素不能缓存，仍按ID查找
+const el = {};
+
+// 月份和星期名称表，星期按 Date.getDay() 的返回值索引
+const MONTH_NAMES = Object.freeze(['一月', '二月', '三月', '四月', '五月', '六月', '七月', '八月', '九月', '十月', '十一月', '十二月']);
+const WEEKDAY_NAMES = Object.freeze(['周日', '周一', '周二', '周三', '周四', '周五', '周六']);
+// 00-31的两位数字符串表，拼接日期字符串时代替 padStart
+const TWO_DIGITS = Object.freeze(Array.from({ length: 32 }, (_, n) => String(n).padStart(2, '0')));
+// 月视图的骨架（星期标题行和6行7列的日期单元格），首次渲染时构建，之后每次渲染直接克隆
+const MONTH_GRID_CELLS = 42;
+let monthScaffoldTemplate = null;
+// 月视图中用于在日期单元格接近可见区域时才生成事件的观察器
+let monthCellObserver = null;
+// 周视图和日视图的时间轴标签列、各天的列及其标题，按网格元素索引
+const timeGridSkeletons = new Map();
+// 当前时间指示线（只创建一次，渲染时移动到今天的列），以及已自动滚动到当前时间的视图
+let timeIndicatorEl = null;
+let timeIndicatorScrolledView = null;
+
+// 当前激活的视图按钮、导航控件和视图网格
+let activeViewElements = {};
+
+// setTextOffDom最近一次写入各元素的文本长度和哈希值，内容相同时跳过写入
+const textOffDomHashes = new Map();
+
+// 按钮ID到点击处理函数的对应表，由 handleButtonClick 统一分派
+const BUTTON_ACTIONS = Object.freeze({
+    // 视图切换按钮
+    'month-view': () => switchView('month'),
+    'week-view': () => switchView('week'),
+    'day-view': () => switchView('day'),
+    'list-view': () => switchView('list'),
+    'completed-view': () => switchView('completed'),
+    'time-review-view': () => switchView('time-review'),
+    'llm-view': () => switchView('llm'),
+    // 日期导航按钮
+    'prev-month': previousMonth,
+    'next-month': nextMonth,
+    'prev-week': previousWeek,
+    'next-week': nextWeek,
+    'prev-day': previousDay,
+    'next-day': nextDay,
+    // 事件详情和完成任务对话框
+    'close-details': () => el.eventDetails.classList.add('hidden'),
+    'close-complete-dialog': closeCompleteDialog,
+    'cancel-complete': closeCompleteDialog,
+    'submit-complete': submitCompleteTask,
+    // LLM查询
+    'submit-llm': submitLLMQuery,
+    'new-query': startNewLLMQuery
+});
+
+// 按被点击按钮的ID分派到对应的处理函数
+function handleButtonClick(e) {
+    const button = e.target.closest('button[id]');
+    const action = button && BUTTON_ACTIONS[button.id];
+    if (action) {
+        action(e);
+    }
+}
+
+// 关闭完成任务对话框：恢复事件的空闲状态，清空当前正在完成的事件和表单
+function closeCompleteDialog() {
+    document.getElementById('complete-task-dialog').classList.add('hidden');
+    if (currentCompletingEvent) {
+        delete currentCompletingEvent._status;
+    }
+    currentCompletingEvent = null;
+    clearCompleteTaskForm();
+}
 
 // DOM加载完成后执行
 document.addEventListener('DOMContentLoaded', function() {
     console.log("DOM加载完成");
     
-    // 初始化视图
-    initializeView();
-    
-    // 绑定视图切换按钮
-    document.getElementById('month-view').addEventListener('click', function() {
-        switchView('month');
-    });
-    
-    document.getElementById('week-view').addEventListener('click', function() {
-        switchView('week');
-    });
-    
-    document.getElementById('day-view').addEventListener('click', function() {
-        switchView('day');
-    });
-    
-    document.getElementById('list-view').addEventListener('click', function() {
-        switchView('list');
-    });
-    
-    document.getElementById('completed-view').addEventListener('click', function() {
-        switchView('completed');
+    // 缓存常用的DOM元素
+    Object.assign(el, {
+        loadingIndicator: document.getElementById('loading-indicator'),
+        submitLLM: document.getElementById('submit-llm'),
+        llmResults: document.getElementById('llm-results'),
+        llmForm: document.querySelector('.llm-form'),
+        monthGrid: document.getElementById('month-grid'),
+        weekGrid: document.getElementById('week-grid'),
+        dayGrid: document.getElementById('day-grid'),
+        listGrid: document.getElementById('list-grid'),
+        calendarContainer: document.getElementById('calendar-container'),
+        eventDetails: document.getElementById('event-details')
     });
     
-    document.getElementById('time-review-view').addEventListener('click', function() {
-        switchView('time-review');
-    });
+    // 初始化视图
+    initializeView();
     
-    document.getElementById('llm-view').addEventListener('click', function() {
-        switchView('llm');
-    });
+    // 页面上的按钮通过document上的一个监听器按ID查表处理
+    document.addEventListener('click', handleButtonClick);
     
-    // 绑定日期导航按钮
-    document.getElementById('prev-month').addEventListener('click', previousMonth);
-    document.getElementById('next-month').addEventListener('click', nextMonth);
-    document.getElementById('prev-week').addEventListener('click', previousWeek);
-    document.getElementById('next-week').addEventListener('click', nextWeek);
-    document.getElementById('prev-day').addEventListener('click', previousDay);
-    document.getElementById('next-day').addEventListener('click', nextDay);
-    
-    // 绑定事件详情关闭按钮
-    document.getElementById('close-details').addEventListener('click', function() {
-        document.getElementById('event-details').classList.add('hidden');
-    });
+    // 事件详情面板中的操作按钮使用事件委托
+    el.eventDetails.addEventListener('click', handleDetailsClick);
     
-    // 绑定完成任务对话框事件
-    document.getElementById('close-complete-dialog').addEventListener('click', function() {
-        document.getElementById('complete-task-dialog').classList.add('hidden');
-        // 清空当前正在完成的事件
-        currentCompletingEvent = null;
-        // 清空表单
-        clearCompleteTaskForm();
-    });
-
-    document.getElementById('cancel-complete').addEventListener('click', function() {
-        document.getElementById('complete-task-dialog').classList.add('hidden');
-        // 从处理集合中移除事件ID
-        if (currentCompletingEvent) {
-            processingEvents.delete(currentCompletingEvent.id);
-        }
-        // 清空当前正在完成的事件
-        currentCompletingEvent = null;
-        // 清空表单
-        clearCompleteTaskForm();
-    });
-
-    document.getElementById('submit-complete').addEventListener('click', submitCompleteTask);
+    // 所有视图中的事件项和按钮都通过视图容器上的一个监听器委托处理，滚动同样只绑定一个监听器
+    el.calendarContainer.addEventListener('click', handleCalendarContainerClick);
+    el.calendarContainer.addEventListener('scroll', handleCalendarContainerScroll, { passive: true });
 
     // 初始化时间选择器
     const now = new Date();
@@ -103,17 +202,9 @@ document.addEventListener('DOMContentLoaded', function() {
 function initializeView() {
     console.log("初始化视图");
     
-    // 设置默认视图为月视图
+    // 设置默认视图为月视图，激活月视图的按钮、导航和网格
     currentView = 'month';
-    
-    // 激活月视图按钮
-    document.getElementById('month-view').classList.add('active');
-    
-    // 激活月视图导航
-    document.getElementById('month-navigation').classList.add('active');
-    
-    // 激活月视图网格
-    document.getElementById('month-grid').classList.add('active');
+    setActiveViewElements('month');
     
     // 更新日期显示
     updateDateDisplay();
@@ -122,39 +213,36 @@ function initializeView() {
     loadEvents();
 }
 
+// 激活视图对应的按钮、导航控件（没有导航控件的视图不显示任何导航）和网格，
+// 只修改之前激活的元素和新激活的元素
+function setActiveViewElements(viewType) {
+    const next = {
+        button: document.getElementById(`${viewType}-view`),
+        nav: document.getElementById(`${viewType}-navigation`),
+        grid: document.getElementById(`${viewType}-grid`)
+    };
+    Object.keys(next).forEach(key => {
+        if (activeViewElements[key] === next[key]) return;
+        if (activeViewElements[key]) {
+            activeViewElements[key].classList.remove('active');
+        }
+        if (next[key]) {
+            next[key].classList.add('active');
+        }
+    });
+    activeViewElements = next;
+}
+
 // 切换视图
 function switchView(viewType) {
     console.log("切换视图到:", viewType);
     
-    // 更新当前视图
+    // 更新当前视图，切换后重新允许滚动到当前时间
     currentView = viewType;
+    timeIndicatorScrolledView = null;
     
-    // 更新视图按钮状态
-    document.querySelectorAll('.view-controls button').forEach(button => {
-        button.classList.toggle('active', button.id === `${viewType}-view`);
-    });
-    
-    // 更新导航控件显示
-    document.querySelectorAll('.navigation-controls').forEach(nav => {
-        nav.classList.remove('active');
-    });
-    
-    // 显示对应的导航控件
-    if (viewType === 'month') {
-        document.getElementById('month-navigation').classList.add('active');
-    } else if (viewType === 'week') {
-        document.getElementById('week-navigation').classList.add('active');
-    } else if (viewType === 'day') {
-        document.getElementById('day-navigation').classList.add('active');
-    }
-    
-    // 隐藏所有视图
-    document.querySelectorAll('.view').forEach(view => {
-        view.classList.remove('active');
-    });
-    
-    // 显示选中的视图
-    document.getElementById(`${viewType}-grid`).classList.add('active');
+    // 更新视图按钮状态、导航控件和显示的视图
+    setActiveViewElements(viewType);
     
     // 更新日期显示
     updateDateDisplay();
@@ -165,17 +253,14 @@ function switchView(viewType) {
     } else if (viewType === 'time-review') {
         renderTimeReviewView();
     } else if (viewType !== 'llm') {
-        loadEvents();
+        scheduleLoadEvents();
     }
 }
 
 // 更新日期显示
 function updateDateDisplay() {
-    const monthNames = ['一月', '二月', '三月', '四月', '五月', '六月', '七月', '八月', '九月', '十月', '十一月', '十二月'];
-    const weekdays = ['周日', '周一', '周二', '周三', '周四', '周五', '周六'];
-    
     // 更新月份显示
-    document.getElementById('current-month').textContent = `${currentDate.getFullYear()}年 ${monthNames[currentDate.getMonth()]}`;
+    document.getElementById('current-month').textContent = `${currentDate.getFullYear()}年 ${MONTH_NAMES[currentDate.getMonth()]}`;
     
     // 更新周显示
     const startOfWeek = new Date(currentDate);
@@ -191,7 +276,7 @@ function updateDateDisplay() {
     
     // 更新日显示
     document.getElementById('current-day').textContent = 
-        `${currentDate.getFullYear()}年${currentDate.getMonth() + 1}月${currentDate.getDate()}日 ${weekdays[currentDate.getDay()]}`;
+        `${currentDate.getFullYear()}年${currentDate.getMonth() + 1}月${currentDate.getDate()}日 ${WEEKDAY_NAMES[currentDate.getDay()]}`;
 }
 
 // 加载事件数据
@@ -202,14 +287,15 @@ function loadEvents(retry = false) {
         return;
     }
     
-    // 如果已经在加载中，则忽略请求（除非是重试）
-    if (isLoadingEvents && !retry) {
-        console.log("事件数据正在加载中，忽略重复请求");
-        return;
+    // 新的加载请求取代之前尚未完成的请求，取消旧请求以免服务器继续处理被丢弃的响应；
+    // 即使旧请求的结果在取消前已经返回，序号不同也会被丢弃
+    const token = ++loadEventsToken;
+    if (loadEventsController) {
+        loadEventsController.abort();
+    }
+    if (!retry) {
+        clearTimeout(loadEventsRetryTimer);
     }
-    
-    // 设置加载状态
-    isLoadingEvents = true;
     
     // 如果是重试，则增加重试计数
     if (retry) {
@@ -217,7 +303,6 @@ function loadEvents(retry = false) {
         console.log(`重试加载事件数据，第 ${loadEventsRetryCount} 次尝试`);
         if (loadEventsRetryCount > MAX_RETRY_COUNT) {
             console.error(`已达到最大重试次数 ${MAX_RETRY_COUNT}，停止重试`);
-            isLoadingEvents = false;
             loadEventsRetryCount = 0;
             hideLoadingIndicator();
             showNotification('加载事件数据失败，已达到最大重试次数', 'error');
@@ -231,25 +316,14 @@ function loadEvents(retry = false) {
     console.log("开始加载事件数据");
     
     // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    
-    // 显示加载指示器
-    showLoadingIndicator();
+    el.eventDetails.classList.add('hidden');
     
     let dateFrom, dateTo;
     
     // 根据当前视图类型确定日期范围
     switch(currentView) {
         case 'month':
-            // 计算当前月份的起始日期和结束日期
-            const firstDay = new Date(currentDate.getFullYear(), currentDate.getMonth(), 1);
-            // 获取前一天的日期，以包含可能的跨天事件
-            const prevDayOfMonth = new Date(firstDay);
-            prevDayOfMonth.setDate(prevDayOfMonth.getDate() - 1);
-            
-            const lastDay = new Date(currentDate.getFullYear(), currentDate.getMonth() + 1, 0);
-            dateFrom = formatDate(prevDayOfMonth); // 从前一天开始
-            dateTo = formatDate(lastDay);
+            // 月视图按月份请求按日期分组的事件，不需要日期范围
             break;
             
         case 'week':
@@ -289,51 +363,94 @@ function loadEvents(retry = false) {
             break;
     }
     
-    // 构建API URL
-    let apiUrl = `/api/events?date_from=${dateFrom}&date_to=${dateTo}`;
+    // 构建API URL（月视图使用按日期分组的接口，无需在前端再次分组）
+    const monthKey = `${currentDate.getFullYear()}-${TWO_DIGITS[currentDate.getMonth() + 1]}`;
+    const isMonthView = currentView === 'month';
+    let apiUrl = isMonthView
+        ? `/api/events/month/${monthKey}`
+        : `/api/events?date_from=${dateFrom}&date_to=${dateTo}`;
     console.log(`加载事件数据，API URL: ${apiUrl}`);
     
+    // 最近加载过的数据仍在有效期内时直接使用，不发送请求
+    const cached = eventsResponseCache.get(apiUrl);
+    if (cached && Date.now() - cached.fetchedAt < EVENTS_CACHE_TTL_MS) {
+        loadEventsController = null;
+        touchEventsCache(apiUrl, cached);
+        applyLoadedEvents(cached.data, isMonthView);
+        hideLoadingIndicator();
+        loadEventsRetryCount = 0;
+        return;
+    }
+    
+    // 显示加载指示器
+    showLoadingIndicator();
+    
     // 设置请求超时
     const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 10000);
-    
-    // 获取事件数据
-    fetch(apiUrl, { signal: controller.signal })
+    loadEventsController = controller;
+    let timedOut = false;
+    const timeoutId = setTimeout(() => {
+        timedOut = true;
+        controller.abort();
+    }, 10000);
+    
+    // 获取事件数据，已过期的缓存数据通过ETag验证，未变化时服务器返回304
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    fetch(apiUrl, { signal: controller.signal, headers: headers })
         .then(response => {
             // 清除超时
             clearTimeout(timeoutId);
             
             console.log(`事件数据请求已发送，状态码: ${response.status}`);
+            if (response.status === 304 && cached) {
+                return cached.data;
+            }
             if (!response.ok) {
                 throw new Error(`服务器响应错误: ${response.status}`);
             }
-            return response.json();
+            return response.json().then(data => {
+                touchEventsCache(apiUrl, { data: data, etag: response.headers.get('ETag') });
+                return data;
+            });
         })
         .then(data => {
-            console.log(`事件数据已加载，共 ${data.length} 个事件`);
-            events = data;
-            renderCurrentView();
+            if (token !== loadEventsToken) {
+                console.log('事件数据请求已被新的请求取代');
+                return;
+            }
+            loadEventsController = null;
+            if (cached && data === cached.data) {
+                touchEventsCache(apiUrl, cached);
+            }
+            applyLoadedEvents(data, isMonthView);
             
             // 隐藏加载指示器
             hideLoadingIndicator();
             
-            // 重置加载状态和重试计数
-            isLoadingEvents = false;
+            // 重置重试计数
             loadEventsRetryCount = 0;
         })
         .catch(error => {
+            clearTimeout(timeoutId);
+            
+            // 请求已被新的加载请求取代，直接忽略
+            if (token !== loadEventsToken || (error.name === 'AbortError' && !timedOut)) {
+                console.log('事件数据请求已被新的请求取代');
+                return;
+            }
+            loadEventsController = null;
+            
             console.error('加载事件数据出错:', error);
             
             // 如果是超时或网络错误，则尝试重试
             if (error.name === 'AbortError' || error.message.includes('network') || error.message.includes('failed')) {
                 console.log('网络错误或超时，将尝试重试');
                 // 延迟一段时间后重试
-                setTimeout(() => {
+                loadEventsRetryTimer = setTimeout(() => {
                     loadEvents(true);
                 }, 1000); // 1秒后重试
             } else {
-                // 其他错误，重置加载状态
-                isLoadingEvents = false;
+                // 其他错误，重置重试计数
                 loadEventsRetryCount = 0;
                 
                 // 隐藏加载指示器
@@ -345,6 +462,90 @@ function loadEvents(retry = false) {
         });
 }
 
+// 将加载到的事件数据设为当前数据并安排渲染
+function applyLoadedEvents(data, isMonthView) {
+    // 每份数据的布局、排序和分组只计算一次，从缓存中再次使用同一份数据时直接复用
+    let prepared = preparedEventData.get(data);
+    if (!prepared) {
+        // 月视图的接口返回按日期分组的事件
+        const list = isMonthView ? Object.values(data).flat() : data;
+        list.forEach(event => {
+            event._layout = cachedEventLayout(event.time_range);
+        });
+        // 按日期和开始时间排序一次，再按日期分组，各组因此也已按开始时间排序
+        list.sort(compareEvents);
+        // 同一天内时间重叠的事件分列显示
+        assignEventLanes(list);
+        prepared = {
+            events: list,
+            index: groupEventsByDate(list),
+            overnight: groupEventsByDate(list.filter(event => event._layout.isOvernight))
+        };
+        preparedEventData.set(data, prepared);
+    }
+    
+    events = prepared.events;
+    eventsByDate = prepared.index;
+    overnightEventsByDate = prepared.overnight;
+    calendarEventMap.clear();
+    events.forEach(event => {
+        calendarEventMap.set(eventKey(event), event);
+    });
+    console.log(`事件数据已加载，共 ${events.length} 个事件`);
+    scheduleRender();
+}
+
+// 记录（或刷新）一条事件数据缓存并移到最近使用的位置，超出容量时淘汰最久未使用的一条
+function touchEventsCache(apiUrl, entry) {
+    eventsResponseCache.delete(apiUrl);
+    entry.fetchedAt = Date.now();
+    eventsResponseCache.set(apiUrl, entry);
+    if (eventsResponseCache.size > EVENTS_CACHE_MAX) {
+        eventsResponseCache.delete(eventsResponseCache.keys().next().value);
+    }
+}
+
+// 事件被完成、删除或由LLM查询修改后，丢弃所有缓存的事件数据
+function invalidateEventsCache() {
+    eventsResponseCache.clear();
+}
+
+// 延迟加载事件数据，快速连续的导航和视图切换只会触发最后一次加载
+function scheduleLoadEvents() {
+    clearTimeout(loadEventsTimer);
+    loadEventsTimer = setTimeout(() => {
+        loadEventsTimer = null;
+        loadEvents();
+    }, LOAD_EVENTS_DEBOUNCE_MS);
+}
+
+// 在下一帧更新日期显示，同一帧内的多次导航只更新一次
+function scheduleDateDisplayUpdate() {
+    if (dateDisplayFrame !== null) return;
+    dateDisplayFrame = requestAnimationFrame(() => {
+        dateDisplayFrame = null;
+        updateDateDisplay();
+    });
+}
+
+// 日期导航后的共同处理：日期本身已立即修改，日期显示在下一帧更新，
+// 事件数据延迟加载，快速连续点击只会加载最后停留的日期范围
+function afterDateNavigation() {
+    // 关闭事件详情弹窗
+    el.eventDetails.classList.add('hidden');
+    scheduleDateDisplayUpdate();
+    scheduleLoadEvents();
+}
+
+// 在下一帧渲染当前视图，同一帧内的多次请求只渲染一次
+function scheduleRender() {
+    if (renderFrame !== null) return;
+    renderFrame = requestAnimationFrame(() => {
+        renderFrame = null;
+        renderCurrentView();
+    });
+}
+
 // 显示加载指示器
 function showLoadingIndicator() {
     // 创建加载指示器元素（如果不存在）
@@ -371,10 +572,7 @@ function hideLoadingIndicator() {
 
 // 格式化日期为YYYY-MM-DD
 function formatDate(date) {
-    const year = date.getFullYear();
-    const month = String(date.getMonth() + 1).padStart(2, '0');
-    const day = String(date.getDate()).padStart(2, '0');
-    return `${year}-${month}-${day}`;
+    return `${date.getFullYear()}-${TWO_DIGITS[date.getMonth() + 1]}-${TWO_DIGITS[date.getDate()]}`;
 }
 
 // 解析YYYY-MM-DD格式的日期字符串为Date对象，确保正确处理时区
@@ -385,219 +583,440 @@ function parseDate(dateString) {
     return new Date(year, month - 1, day);
 }
 
+// 由日期字符串得到的派生字符串在渲染时会被反复计算，按日期字符串缓存。
+// 不缓存Date对象本身，因为调用方会修改返回的Date
+const DATE_STRING_CACHE_MAX = 512;
+const nextDateCache = new Map();
+const dateHeadingCache = new Map();
+
+// 从缓存中取出dateString对应的值，未命中时调用compute计算并存入，超出容量时清空缓存
+function cachedByDate(cache, dateString, compute) {
+    let value = cache.get(dateString);
+    if (value === undefined) {
+        if (cache.size >= DATE_STRING_CACHE_MAX) {
+            cache.clear();
+        }
+        value = compute(dateString);
+        cache.set(dateString, value);
+    }
+    return value;
+}
+
+// 返回YYYY-MM-DD格式日期的后一天
+function nextDateString(dateString) {
+    return cachedByDate(nextDateCache, dateString, date => {
+        const next = parseDate(date);
+        next.setDate(next.getDate() + 1);
+        return formatDate(next);
+    });
+}
+
+// 返回日期分组标题：日期和星期，例如“2024-03-15 周五”
+function dateHeading(dateString) {
+    return cachedByDate(dateHeadingCache, dateString, date => `${date} ${WEEKDAY_NAMES[parseDate(date).getDay()]}`);
+}
+
 // 上个月
 function previousMonth() {
     currentDate = new Date(currentDate.getFullYear(), currentDate.getMonth() - 1, 1);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
 // 下个月
 function nextMonth() {
     currentDate = new Date(currentDate.getFullYear(), currentDate.getMonth() + 1, 1);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
 // 上一周
 function previousWeek() {
     currentDate.setDate(currentDate.getDate() - 7);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
 // 下一周
 function nextWeek() {
     currentDate.setDate(currentDate.getDate() + 7);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
 // 前一天
 function previousDay() {
     currentDate.setDate(currentDate.getDate() - 1);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
 // 后一天
 function nextDay() {
     currentDate.setDate(currentDate.getDate() + 1);
-    // 关闭事件详情弹窗
-    document.getElementById('event-details').classList.add('hidden');
-    updateDateDisplay();
-    loadEvents();
+    afterDateNavigation();
 }
 
-// 添加当前时间指示线并滚动到当前时间
-function addCurrentTimeIndicator() {
-    // 只在周视图和日视图中添加
-    if (currentView !== 'week' && currentView !== 'day') return;
-    
-    // 获取当前时间
+// 当前时间在时间轴上的纵向位置
+function currentTimeTop() {
     const now = new Date();
-    const hours = now.getHours();
-    const minutes = now.getMinutes();
+    return (now.getHours() + now.getMinutes() / 60) * 40 + 30; // 30px是头部高度
+}
+
+// 将当前时间指示线放到今天所在的列（column为空表示当前显示的日期不包含今天时移除指示线）。
+// 指示线只创建一次，之后只移动位置，每分钟更新一次纵向位置；每次切换到周视图或日视图时滚动到当前时间附近一次
+function addCurrentTimeIndicator(column) {
+    if (!column) {
+        if (timeIndicatorEl) {
+            timeIndicatorEl.remove();
+        }
+        return;
+    }
     
-    // 计算指示线位置
-    const top = (hours + minutes / 60) * 40 + 30; // 30px是头部高度
+    if (!timeIndicatorEl) {
+        timeIndicatorEl = document.createElement('div');
+        timeIndicatorEl.className = 'current-time-indicator';
+        setInterval(() => {
+            if (timeIndicatorEl.isConnected) {
+                timeIndicatorEl.style.setProperty('--top', `${currentTimeTop()}px`);
+            }
+        }, 60000);
+    }
     
-    // 在周视图中添加指示线
-    if (currentView === 'week') {
-        const columns = document.querySelectorAll('.week-day-column');
-        const today = now.getDay(); // 0-6，表示周日到周六
-        
-        // 只在当天的列中添加指示线
-        if (columns[today]) {
-            const indicator = document.createElement('div');
-            indicator.className = 'current-time-indicator';
-            indicator.style.top = `${top}px`;
-            columns[today].appendChild(indicator);
-            
-            // 滚动到当前时间附近（稍微往上一点，以便看到更多未来的事件）
-            setTimeout(() => {
-                const container = document.getElementById('calendar-container');
-                container.scrollTop = Math.max(0, top - 200); // 滚动到当前时间上方200px处
-            }, 100);
-        }
+    const top = currentTimeTop();
+    timeIndicatorEl.style.setProperty('--top', `${top}px`);
+    if (timeIndicatorEl.parentNode !== column) {
+        column.appendChild(timeIndicatorEl);
     }
     
-    // 在日视图中添加指示线
-    if (currentView === 'day') {
-        const column = document.querySelector('.day-column');
-        if (column) {
-            const indicator = document.createElement('div');
-            indicator.className = 'current-time-indicator';
-            indicator.style.top = `${top}px`;
-            column.appendChild(indicator);
-            
-            // 滚动到当前时间附近（稍微往上一点，以便看到更多未来的事件）
-            setTimeout(() => {
-                const container = document.getElementById('calendar-container');
-                container.scrollTop = Math.max(0, top - 200); // 滚动到当前时间上方200px处
-            }, 100);
+    // 滚动到当前时间附近（稍微往上一点，以便看到更多未来的事件）
+    if (timeIndicatorScrolledView !== currentView) {
+        timeIndicatorScrolledView = currentView;
+        el.calendarContainer.scrollTop = Math.max(0, top - 200); // 滚动到当前时间上方200px处
+    }
+}
+
+// 按日期、开始时间比较两个事件，用于对事件列表排序
+function compareEvents(a, b) {
+    if (a.date !== b.date) {
+        return a.date < b.date ? -1 : 1;
+    }
+    return (a._layout ? a._layout.start : 0) - (b._layout ? b._layout.start : 0);
+}
+
+// 将事件按日期分组，返回 {日期: [事件...]}
+function groupEventsByDate(eventList) {
+    const index = {};
+    eventList.forEach(event => {
+        if (!index[event.date]) {
+            index[event.date] = [];
         }
+        index[event.date].push(event);
+    });
+    return index;
+}
+
+// 当前视图显示的日期范围的标识：月视图为YYYY-MM，周视图为周日的日期，其余为当前日期
+function currentViewDateKey() {
+    if (currentView === 'month') {
+        return `${currentDate.getFullYear()}-${TWO_DIGITS[currentDate.getMonth() + 1]}`;
+    }
+    if (currentView === 'week') {
+        const startOfWeek = new Date(currentDate);
+        startOfWeek.setDate(currentDate.getDate() - currentDate.getDay());
+        return formatDate(startOfWeek);
     }
+    return formatDate(currentDate);
 }
 
 // 渲染当前视图
 function renderCurrentView() {
     console.log("渲染当前视图:", currentView);
     
-    // 清空所有视图
-    document.getElementById('month-grid').innerHTML = '';
-    document.getElementById('week-grid').innerHTML = '';
-    document.getElementById('day-grid').innerHTML = '';
-    document.getElementById('list-grid').innerHTML = '';
+    // 各视图使用加载数据时建立的按日期索引直接查找，而不是逐格过滤整个事件列表
+    const eventsIndex = eventsByDate;
+    const dateKey = currentViewDateKey();
+    
+    // 视图和日期范围都与上次渲染相同时（如完成、删除事件后刷新数据），只更新发生变化的事件
+    if (currentViewPlan && lastRendered && lastRendered.view === currentView && lastRendered.dateKey === dateKey) {
+        updateRenderedEvents(eventsIndex);
+        return;
+    }
+    
+    // 移除已放置的事件节点并清空月视图和列表视图；周视图和日视图的时间轴和列保留下来，
+    // 渲染时只更新日期标题
+    renderedEventNodes.forEach(entry => entry.nodes.forEach(releaseEventItem));
+    renderedEventNodes.clear();
+    el.monthGrid.textContent = '';
+    el.listGrid.textContent = '';
+    currentViewPlan = null;
+    if (monthCellObserver) {
+        monthCellObserver.disconnect();
+        monthCellObserver = null;
+    }
     
     // 根据当前视图类型渲染对应的视图
     switch(currentView) {
         case 'month':
-            renderMonthView();
+            renderMonthView(eventsIndex);
             break;
         case 'week':
-            renderWeekView();
+            renderWeekView(eventsIndex);
             break;
         case 'day':
-            renderDayView();
+            renderDayView(eventsIndex);
             break;
         case 'list':
             renderListView();
             break;
         // 注意：completed 和 time-review 视图在 switchView 函数中处理
+        // 当前时间指示线由周视图和日视图在渲染结束时各自添加
     }
     
-    // 添加当前时间指示线
-    if (currentView === 'week' || currentView === 'day') {
-        addCurrentTimeIndicator();
-    }
+    lastRendered = { view: currentView, dateKey: dateKey };
 }
 
-// 渲染月视图
-function renderMonthView() {
-    const monthGrid = document.getElementById('month-grid');
-    monthGrid.innerHTML = ''; // 清空内容
+// 影响事件项显示内容的字段，任一字段变化时需要重新生成该事件的节点
+function eventSignature(event) {
+    const layout = event._layout;
+    const lanes = layout ? [layout.current.lane, layout.current.lanes, layout.next && layout.next.lane, layout.next && layout.next.lanes] : [];
+    return [event.title, event.time_range, event.event_type, event.is_completed, event.can_complete, event.recurrence_rule, ...lanes].join('|');
+}
+
+// 按当前视图的放置方式生成事件节点，并记录下来供增量更新使用
+function placeViewEvent(event) {
+    renderedEventNodes.set(eventKey(event), {
+        signature: eventSignature(event),
+        nodes: currentViewPlan.place(event)
+    });
+}
+
+// 与已渲染的事件比较，只移除消失或发生变化的事件节点并放置新的节点
+function updateRenderedEvents(eventsIndex) {
+    const wanted = new Map();
+    currentViewPlan.collect(eventsIndex).forEach(event => {
+        wanted.set(eventKey(event), event);
+    });
     
-    // 添加星期标题
-    const weekdays = ['周日', '周一', '周二', '周三', '周四', '周五', '周六'];
-    weekdays.forEach(day => {
-        const dayHeader = document.createElement('div');
-        dayHeader.className = 'day-header';
-        dayHeader.textContent = day;
-        monthGrid.appendChild(dayHeader);
+    renderedEventNodes.forEach((entry, key) => {
+        const event = wanted.get(key);
+        if (!event || entry.signature !== eventSignature(event)) {
+            entry.nodes.forEach(releaseEventItem);
+            renderedEventNodes.delete(key);
+        }
     });
     
-    // 获取当前月的第一天是星期几
-    const firstDay = new Date(currentDate.getFullYear(), currentDate.getMonth(), 1);
-    const firstDayOfWeek = firstDay.getDay();
+    const changedDates = new Set();
+    wanted.forEach((event, key) => {
+        if (!renderedEventNodes.has(key)) {
+            placeViewEvent(event);
+            changedDates.add(event.date);
+        }
+    });
     
-    // 获取当前月的天数
-    const lastDay = new Date(currentDate.getFullYear(), currentDate.getMonth() + 1, 0);
-    const daysInMonth = lastDay.getDate();
+    // 新节点追加在容器末尾，需要时按事件顺序重新排列
+    if (currentViewPlan.reorder) {
+        changedDates.forEach(date => currentViewPlan.reorder(date, eventsIndex[date] || []));
+    }
+}
+
+// 移除事件项节点并放回节点池
+function releaseEventItem(node) {
+    node.remove();
+    if (eventItemPool.length < EVENT_ITEM_POOL_MAX) {
+        eventItemPool.push(node);
+    }
+}
+
+// 周视图或日视图的网格中当前可见的纵向范围（含上下缓冲），相对于网格顶部
+function visibleTimeGridRange(grid) {
+    const container = el.calendarContainer;
+    const gridTop = grid.getBoundingClientRect().top - container.getBoundingClientRect().top;
+    return [-gridTop - TIME_GRID_BUFFER_PX, -gridTop + container.clientHeight + TIME_GRID_BUFFER_PX];
+}
+
+// 筛选出在时间轴上与[start, end)相交的事件，跨天事件的任一部分相交即可
+function eventsInTimeWindow(eventList, start, end) {
+    const intersects = segment => segment && segment.top < end && segment.top + segment.height > start;
+    return eventList.filter(event => {
+        const layout = event._layout;
+        return layout && (intersects(layout.current) || intersects(layout.next));
+    });
+}
+
+// 为周视图或日视图生成放置方式：只收集可见时间段内的事件，滚动时按最新数据补上或移除
+function timeGridPlan(grid, collectDates, place) {
+    let latestIndex = {};
+    return {
+        collect: index => {
+            latestIndex = index;
+            const [start, end] = visibleTimeGridRange(grid);
+            return eventsInTimeWindow(collectDates(index), start, end);
+        },
+        place: place,
+        refreshWindow: () => updateRenderedEvents(latestIndex)
+    };
+}
+
+// 滚动时在下一帧更新周视图和日视图中放置的事件，同一帧内的多次滚动只处理一次
+function scheduleTimeGridWindowUpdate() {
+    if (!currentViewPlan || !currentViewPlan.refreshWindow || timeGridScrollFrame !== null) {
+        return;
+    }
     
-    // 添加上个月的占位日期
-    for (let i = 0; i < firstDayOfWeek; i++) {
-        const dayCell = document.createElement('div');
-        dayCell.className = 'day-cell empty';
-        monthGrid.appendChild(dayCell);
+    timeGridScrollFrame = requestAnimationFrame(function() {
+        timeGridScrollFrame = null;
+        if (currentViewPlan && currentViewPlan.refreshWindow) {
+            currentViewPlan.refreshWindow();
+        }
+    });
+}
+
+// 在时间轴列中放置事件：当天部分放在column，跨天事件的次日部分放在nextColumn
+function placeTimedEvent(event, column, nextColumn) {
+    const nodes = [];
+    const layout = event._layout;
+    if (!layout) return nodes;
+    
+    if (column) {
+        nodes.push(renderEventItem(event, column, {
+            position: layout.current,
+            customContent: `${event.time_range}: ${event.title}`
+        }));
     }
     
-    // 添加当前月的日期
-    for (let day = 1; day <= daysInMonth; day++) {
-        const dayCell = document.createElement('div');
-        dayCell.className = 'day-cell';
-        
-        const dayNumber = document.createElement('div');
-        dayNumber.className = 'day-number';
-        dayNumber.textContent = day;
-        dayCell.appendChild(dayNumber);
-        
-        // 检查当天是否有事件
-        const currentDateStr = `${currentDate.getFullYear()}-${String(currentDate.getMonth() + 1).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
-        const dayEvents = events.filter(event => event.date === currentDateStr);
+    if (layout.isOvernight && nextColumn) {
+        nodes.push(renderEventItem(event, nextColumn, {
+            position: layout.next,
+            customContent: `(续) ${event.title}`
+        }));
+    }
+    
+    return nodes;
+}
+
+// 返回月视图骨架的文档片段，首次调用时构建
+function monthScaffold() {
+    if (!monthScaffoldTemplate) {
+        monthScaffoldTemplate = document.createElement('template');
+        const content = monthScaffoldTemplate.content;
         
-        // 添加事件到日期单元格
-        dayEvents.forEach(event => {
-            renderEventItem(event, dayCell);
+        // 星期标题
+        WEEKDAY_NAMES.forEach(day => {
+            const dayHeader = document.createElement('div');
+            dayHeader.className = 'day-header';
+            dayHeader.textContent = day;
+            content.appendChild(dayHeader);
         });
         
-        monthGrid.appendChild(dayCell);
+        // 日期单元格，每个单元格带一个日期数字元素
+        for (let i = 0; i < MONTH_GRID_CELLS; i++) {
+            const dayCell = document.createElement('div');
+            dayCell.className = 'day-cell';
+            const dayNumber = document.createElement('div');
+            dayNumber.className = 'day-number';
+            dayCell.appendChild(dayNumber);
+            content.appendChild(dayCell);
+        }
     }
+    return monthScaffoldTemplate.content;
+}
+
+// 渲染月视图
+function renderMonthView(eventsIndex) {
+    const monthGrid = el.monthGrid;
+    
+    // 克隆固定的骨架（星期标题和6行7列的日期单元格），在文档片段中填好日期后一次性替换网格内容
+    const frag = monthScaffold().cloneNode(true);
+    const cells = frag.querySelectorAll('.day-cell');
+    
+    const year = currentDate.getFullYear();
+    const month = currentDate.getMonth();
+    
+    // 本月所有日期字符串的公共前缀（YYYY-MM-），循环中只需拼接日
+    const monthPrefix = `${year}-${TWO_DIGITS[month + 1]}-`;
+    
+    // 获取当前月的第一天是星期几
+    const firstDayOfWeek = new Date(year, month, 1).getDay();
     
-    // 计算需要添加的下个月占位日期数量
-    const totalCells = 42; // 6行7列
-    const remainingCells = totalCells - (firstDayOfWeek + daysInMonth);
+    // 获取当前月的天数
+    const daysInMonth = new Date(year, month + 1, 0).getDate();
+    
+    // 填写当前月的日期，上个月和下个月的位置作为空白占位
+    const dayCells = new Map();
+    cells.forEach((dayCell, i) => {
+        const day = i - firstDayOfWeek + 1;
+        if (day < 1 || day > daysInMonth) {
+            dayCell.className = 'day-cell empty';
+            dayCell.textContent = '';
+            return;
+        }
+        
+        dayCell.firstChild.textContent = day;
+        const dateStr = monthPrefix + TWO_DIGITS[day];
+        dayCell.dataset.date = dateStr;
+        dayCells.set(dateStr, dayCell);
+    });
     
-    // 添加下个月的占位日期
-    for (let i = 0; i < remainingCells; i++) {
-        const dayCell = document.createElement('div');
-        dayCell.className = 'day-cell empty';
-        monthGrid.appendChild(dayCell);
+    // 将事件添加到所在日期的单元格；尚未接近可见区域的单元格先不生成事件节点，
+    // 进入可见区域时再按最新的事件数据补上
+    const hydratedDates = new Set();
+    let latestIndex = eventsIndex;
+    // 补上单元格的事件时，事件节点先写入该文档片段，再一次插入单元格
+    let hydrateTarget = null;
+    const plan = {
+        collect: index => {
+            latestIndex = index;
+            return Array.from(dayCells.keys()).flatMap(date => index[date] || []);
+        },
+        place: event => {
+            const dayCell = dayCells.get(event.date);
+            return dayCell && hydratedDates.has(event.date) ? [renderEventItem(event, hydrateTarget || dayCell)] : [];
+        },
+        reorder: (date, dayEvents) => {
+            const dayCell = dayCells.get(date);
+            dayEvents.forEach(event => {
+                const entry = renderedEventNodes.get(eventKey(event));
+                if (entry) {
+                    entry.nodes.forEach(node => dayCell.appendChild(node));
+                }
+            });
+        }
+    };
+    currentViewPlan = plan;
+    plan.collect(eventsIndex).forEach(placeViewEvent);
+    
+    monthGrid.replaceChildren(frag);
+    
+    const hydrateDate = date => {
+        if (hydratedDates.has(date) || currentViewPlan !== plan) return;
+        hydratedDates.add(date);
+        hydrateTarget = document.createDocumentFragment();
+        (latestIndex[date] || []).forEach(placeViewEvent);
+        dayCells.get(date).appendChild(hydrateTarget);
+        hydrateTarget = null;
+    };
+    
+    if ('IntersectionObserver' in window) {
+        monthCellObserver = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (!entry.isIntersecting) return;
+                monthCellObserver.unobserve(entry.target);
+                hydrateDate(entry.target.dataset.date);
+            });
+        }, { root: el.calendarContainer, rootMargin: '200px 0px' });
+        dayCells.forEach(dayCell => monthCellObserver.observe(dayCell));
+    } else {
+        dayCells.forEach((dayCell, date) => hydrateDate(date));
     }
 }
 
 // 渲染事件项
 function renderEventItem(event, container, options = {}) {
-    const eventItem = document.createElement('div');
-    const isCompleted = event.is_completed === true || event.source === 'completed_task';
+    // 复用节点池中的节点时清除上次留下的周期性标记，类名、内容和内联样式下面会整体重写
+    const eventItem = eventItemPool.pop() || document.createElement('div');
+    delete eventItem.dataset.recurring;
+    // 接口返回的布尔标志以0/1表示
+    const isCompleted = Boolean(event.is_completed) || event.source === 'completed_task';
     
-    // 设置事件项的类名
-    eventItem.className = `event-item type-${event.event_type.toLowerCase().replace(/\s+\(已完成\)$/, '')}`;
-    
-    // 如果事件已完成，添加已完成样式
-    if (isCompleted) {
-        eventItem.classList.add('completed');
-    }
+    // 设置事件项的类名，已完成事件添加已完成样式；事件类型只影响颜色，通过CSS变量设置
+    eventItem.className = isCompleted ? 'event-item completed' : 'event-item';
+    const typeStyle = eventTypeStyle(event.event_type);
     
     // 设置事件内容
     if (options.customContent) {
@@ -611,6 +1030,7 @@ function renderEventItem(event, container, options = {}) {
     // 设置事件ID和日期（用于处理周期性事件）
     eventItem.dataset.eventId = event.id;
     eventItem.dataset.date = event.date;
+    eventItem.dataset.eventKey = eventKey(event);
     
     // 检查是否为周期性事件
     const isRecurring = event.recurrence_rule && event.recurrence_rule.trim() !== '';
@@ -618,11 +1038,6 @@ function renderEventItem(event, container, options = {}) {
         eventItem.dataset.recurring = 'true';
     }
     
-    // 添加点击事件显示详情
-    eventItem.addEventListener('click', function() {
-        showEventDetails(event);
-    });
-    
     // 添加按钮
     if (!options.hideButtons) {
         if (isCompleted) {
@@ -631,67 +1046,28 @@ function renderEventItem(event, container, options = {}) {
             deleteButton.className = 'delete-button';
             deleteButton.textContent = '×';
             deleteButton.title = '删除事件';
-            
-            // 阻止事件冒泡，避免点击按钮时触发事件详情
-            deleteButton.addEventListener('click', function(e) {
-                e.stopPropagation();
-                // 检查事件是否已经处理完成
-                if (completedEvents.has(event.id)) {
-                    console.log(`事件 ${event.id} 已经处理完成，忽略删除请求`);
-                    return;
-                }
-                
-                // 显示一次确认对话框
-                if (!confirm('确定要删除这个已完成的任务吗？')) {
-                    return;
-                }
-                
-                // 将事件ID添加到已处理完成集合中，防止重复处理
-                completedEvents.add(event.id);
-                
-                // 立即禁用按钮，防止重复点击
-                deleteButton.disabled = true;
-                deleteButton.textContent = '...';
-                
-                // 立即从界面上移除该事件（视觉反馈）
-                eventItem.style.opacity = '0.3';
-                eventItem.style.pointerEvents = 'none';
-                eventItem.style.transition = 'all 0.5s ease';
-                eventItem.style.transform = 'translateX(100%)';
-                
-                // 删除事件
-                deleteCompletedTask(event.id);
-            });
+            deleteButton.dataset.action = 'delete';
             
             eventItem.appendChild(deleteButton);
-        } else if (event.can_complete !== false) {
+        } else if (event.can_complete ?? true) {
             // 未完成事件 - 添加完成按钮
             const completeButton = document.createElement('button');
             completeButton.className = 'complete-button';
             completeButton.textContent = '○';
             completeButton.title = '标记为已完成';
-            
-            // 阻止事件冒泡，避免点击按钮时触发事件详情
-            completeButton.addEventListener('click', function(e) {
-                e.stopPropagation();
-                
-                // 检查事件是否已经处理完成
-                if (completedEvents.has(event.id)) {
-                    console.log(`事件 ${event.id} 已经处理完成，忽略请求`);
-                    return;
-                }
-                
-                // 调用标记为已完成函数，传递事件ID和日期
-                markEventCompleted(event.id, event.date);
-            });
+            completeButton.dataset.action = 'complete';
             
             eventItem.appendChild(completeButton);
         }
     }
     
-    // 应用自定义样式
-    if (options.style) {
-        Object.assign(eventItem.style, options.style);
+    // 在时间轴上定位：与类型颜色一起只写入CSS变量，其余定位样式由 .positioned 类提供
+    if (options.position) {
+        eventItem.classList.add('positioned');
+        const { top, height, lane = 0, lanes = 1 } = options.position;
+        eventItem.style.cssText = `${typeStyle}--top: ${top}px; --h: ${height}px; --lane: ${lane}; --lanes: ${lanes}`;
+    } else {
+        eventItem.style.cssText = typeStyle;
     }
     
     // 添加到容器
@@ -700,76 +1076,260 @@ function renderEventItem(event, container, options = {}) {
     return eventItem;
 }
 
-// 解析时间字符串为小时和分钟
-function parseTimeString(timeStr) {
-    const parts = timeStr.trim().split(':');
-    const hour = parseInt(parts[0]);
-    const minute = parseInt(parts[1] || 0);
-    return { hour, minute };
+// 事件在日历视图中的唯一标识：周期性事件的各次实例ID相同，
+// 已完成任务与日程表的ID也可能重复，因此同时使用来源和日期
+function eventKey(event) {
+    return `${event.source || ''}:${event.id}:${event.date}`;
+}
+
+// 视图容器的委托点击处理：只有当前视图可见，按当前视图交给对应的处理函数
+function handleCalendarContainerClick(e) {
+    if (currentView === 'completed') {
+        handleCompletedGridClick(e);
+    } else {
+        handleCalendarGridClick(e);
+    }
+}
+
+// 视图容器滚动时更新列表视图的可见行，以及周视图和日视图可见时间段内的事件
+function handleCalendarContainerScroll() {
+    scheduleListWindowUpdate();
+    scheduleTimeGridWindowUpdate();
 }
 
-// 检查事件是否跨天
-function isOvernightEvent(timeRange) {
-    if (!timeRange || timeRange.length === 0) return false;
+// 日历视图网格的委托点击处理：显示详情或执行按钮操作
+function handleCalendarGridClick(e) {
+    const eventItem = e.target.closest('.event-item');
+    if (!eventItem) return;
+    
+    const event = calendarEventMap.get(eventItem.dataset.eventKey);
+    if (!event) return;
+    
+    const button = e.target.closest('button[data-action]');
+    if (button) {
+        if (button.dataset.action === 'delete') {
+            handleDeleteButtonClick(event, eventItem, button);
+        } else if (button.dataset.action === 'complete') {
+            handleCompleteButtonClick(event);
+        }
+        return;
+    }
     
-    const parts = timeRange.split('-');
-    if (parts.length !== 2) return false;
+    showEventDetails(event);
+}
+
+// 处理事件项上删除按钮的点击
+function handleDeleteButtonClick(event, eventItem, deleteButton) {
+    // 检查事件是否正在处理或已经处理完成
+    if (event._status) {
+        console.log(`事件 ${event.id} 正在处理或已经处理完成，忽略删除请求`);
+        return;
+    }
     
-    const startTime = parseTimeString(parts[0]);
-    const endTime = parseTimeString(parts[1]);
+    // 显示一次确认对话框
+    if (!confirm('确定要删除这个已完成的任务吗？')) {
+        return;
+    }
     
-    // 如果结束时间小于开始时间，则认为是跨天事件
-    return endTime.hour < startTime.hour || (endTime.hour === startTime.hour && endTime.minute < startTime.minute);
+    // 立即禁用按钮，防止重复点击
+    deleteButton.disabled = true;
+    deleteButton.textContent = '...';
+    
+    // 立即从界面上移除该事件（视觉反馈）
+    eventItem.style.opacity = '0.3';
+    eventItem.style.pointerEvents = 'none';
+    eventItem.style.transition = 'all 0.5s ease';
+    eventItem.style.transform = 'translateX(100%)';
+    
+    // 删除事件
+    deleteCompletedTask(event);
 }
 
-// 获取事件在次日的时间范围
-function getNextDayTimeRange(timeRange) {
-    if (!isOvernightEvent(timeRange)) return null;
-    
-    const parts = timeRange.split('-');
-    return `00:00-${parts[1]}`;
+// 处理事件项上完成按钮的点击
+function handleCompleteButtonClick(event) {
+    // 打开完成任务对话框，正在处理或已经处理完成的事件会被忽略
+    markEventCompleted(event);
 }
 
-// 获取事件在当天的时间范围
-function getCurrentDayTimeRange(timeRange) {
-    if (!isOvernightEvent(timeRange)) return timeRange;
+// 按字符编码解析str中[from, to)范围内的H:MM或HH:MM（分钟部分可省略），返回距零点的分钟数，
+// 格式不正确时返回-1。不创建中间字符串或数组
+function parseClockMinutes(str, from, to) {
+    let hour = 0;
+    let minute = 0;
+    let digits = 0;
+    let seenColon = false;
+    for (let i = from; i < to; i++) {
+        const code = str.charCodeAt(i);
+        if (code >= 48 && code <= 57) { // 0-9
+            if (seenColon) {
+                minute = minute * 10 + code - 48;
+            } else {
+                hour = hour * 10 + code - 48;
+            }
+            digits++;
+        } else if (code === 58 && !seenColon && digits > 0) { // ':'
+            seenColon = true;
+        } else if (code !== 32) { // 允许空格
+            return -1;
+        }
+    }
+    return digits > 0 ? hour * 60 + minute : -1;
+}
+
+// 计算事件在时间轴上的位置，起止时间为距当天零点的分钟数
+function positionForMinutes(startMinutes, endMinutes) {
+    // 计算开始位置（相对于时间轴顶部）
+    const top = startMinutes / 60 * 40 + 30; // 30px是头部高度
+    
+    // 计算事件持续时间（分钟），结束时间不晚于开始时间时按跨越午夜计算
+    let duration = endMinutes - startMinutes;
+    if (duration <= 0) {
+        duration = 24 * 60 - startMinutes + endMinutes;
+    }
     
-    const parts = timeRange.split('-');
-    return `${parts[0]}-24:00`;
+    return { top, height: duration / 60 * 40 };
 }
 
-// 计算事件在时间轴上的位置
-function calculateEventPosition(timeRange) {
-    if (!timeRange || timeRange.length === 0) return null;
+// 一次解析事件的时间段，得到当天以及跨天事件在次日的时间轴位置。
+// 在事件加载时计算并缓存到 event._layout，渲染时直接读取
+function computeEventLayout(timeRange) {
+    if (!timeRange) return null;
     
-    const parts = timeRange.split('-');
-    if (parts.length !== 2) return null;
+    // 时间段格式：HH:MM-HH:MM
+    const dash = timeRange.indexOf('-');
+    if (dash === -1) return null;
     
-    const startTime = parseTimeString(parts[0]);
-    const endTime = parseTimeString(parts[1]);
+    const start = parseClockMinutes(timeRange, 0, dash);
+    const end = parseClockMinutes(timeRange, dash + 1, timeRange.length);
+    if (start < 0 || end < 0) return null;
     
-    // 计算开始位置（相对于时间轴顶部）
-    const top = (startTime.hour + startTime.minute / 60) * 40 + 30; // 30px是头部高度
+    // 如果结束时间小于开始时间，则认为是跨天事件
+    const isOvernight = end < start;
     
-    // 计算事件持续时间（小时）
-    let durationHours = endTime.hour - startTime.hour + (endTime.minute - startTime.minute) / 60;
+    return {
+        start,
+        isOvernight,
+        current: isOvernight ? positionForMinutes(start, 24 * 60) : positionForMinutes(start, end),
+        next: isOvernight ? positionForMinutes(0, end) : null
+    };
+}
+
+// 返回时间段对应的事件布局，解析结果按时间段缓存。
+// 分列信息会写入各事件自己的片段，因此每次返回片段的副本
+function cachedEventLayout(timeRange) {
+    let layout = eventLayoutCache.get(timeRange);
+    if (layout === undefined) {
+        if (eventLayoutCache.size >= EVENT_LAYOUT_CACHE_MAX) {
+            eventLayoutCache.clear();
+        }
+        layout = computeEventLayout(timeRange);
+        eventLayoutCache.set(timeRange, layout);
+    }
     
-    // 处理跨天事件（结束时间小于开始时间，表示跨越到第二天）
-    if (durationHours <= 0) {
-        // 计算到午夜的时间 + 从午夜到结束时间的时间
-        durationHours = (24 - startTime.hour - startTime.minute / 60) + (endTime.hour + endTime.minute / 60);
+    return layout && {
+        start: layout.start,
+        isOvernight: layout.isOvernight,
+        current: { ...layout.current },
+        next: layout.next && { ...layout.next }
+    };
+}
+
+// 解析时间回顾中的时间段（开始、结束的分钟数和时长），结果按时间段缓存，调用方只读取不修改
+function reviewTimeRange(timeRange) {
+    let parsed = reviewTimeRangeCache.get(timeRange);
+    if (parsed === undefined) {
+        if (reviewTimeRangeCache.size >= EVENT_LAYOUT_CACHE_MAX) {
+            reviewTimeRangeCache.clear();
+        }
+        const [start, end] = timeRange.split('-').map(t => t.trim());
+        const [startHour, startMin] = start.split(':').map(Number);
+        const [endHour, endMin] = end.split(':').map(Number);
+        parsed = {
+            startMinutes: startHour * 60 + startMin,
+            endMinutes: endHour * 60 + endMin,
+            durationMinutes: (endHour * 60 + endMin) - (startHour * 60 + startMin)
+        };
+        reviewTimeRangeCache.set(timeRange, parsed);
     }
+    return parsed;
+}
+
+// 返回设置事件类型颜色的内联样式，已完成事件的类型去掉“(已完成)”后缀后查找
+function eventTypeStyle(eventType) {
+    let style = eventTypeStyleCache.get(eventType);
+    if (style === undefined) {
+        const colors = EVENT_TYPE_COLORS[eventType.toLowerCase().replace(/\s+\(已完成\)$/, '')];
+        style = colors ? `--ev-bg: ${colors[0]}; --ev-fg: ${colors[1]}; ` : '';
+        eventTypeStyleCache.set(eventType, style);
+    }
+    return style;
+}
+
+// 为每天时间轴上的事件片段分配列：片段按开始位置扫描，放入最靠左的空闲列，
+// 相互重叠的一组片段平分列宽。跨天事件的次日部分计入次日
+function assignEventLanes(eventList) {
+    const segmentsByDate = new Map();
+    const addSegment = (date, segment) => {
+        if (!segmentsByDate.has(date)) {
+            segmentsByDate.set(date, []);
+        }
+        segmentsByDate.get(date).push(segment);
+    };
     
-    // 计算事件高度
-    const height = durationHours * 40;
+    eventList.forEach(event => {
+        const layout = event._layout;
+        if (!layout) return;
+        addSegment(event.date, layout.current);
+        if (layout.next) {
+            addSegment(nextDateString(event.date), layout.next);
+        }
+    });
     
-    return { top, height };
+    segmentsByDate.forEach(segments => {
+        segments.sort((a, b) => a.top - b.top);
+        
+        let group = [];
+        let groupEnd = -Infinity;
+        let laneEnds = [];
+        const closeGroup = () => {
+            group.forEach(segment => {
+                segment.lanes = laneEnds.length;
+            });
+            group = [];
+            laneEnds = [];
+        };
+        
+        segments.forEach(segment => {
+            // 与当前重叠组不再相交时开始新的一组
+            if (segment.top >= groupEnd) {
+                closeGroup();
+            }
+            
+            let lane = laneEnds.findIndex(end => end <= segment.top);
+            if (lane === -1) {
+                lane = laneEnds.length;
+            }
+            laneEnds[lane] = segment.top + segment.height;
+            segment.lane = lane;
+            group.push(segment);
+            groupEnd = group.length === 1 ? laneEnds[lane] : Math.max(groupEnd, laneEnds[lane]);
+        });
+        closeGroup();
+    });
 }
 
-// 渲染周视图
-function renderWeekView() {
-    const weekGrid = document.getElementById('week-grid');
-    weekGrid.innerHTML = ''; // 清空内容
+// 返回周视图或日视图的固定结构：时间轴标签列和各天的列。首次渲染时构建，
+// 之后切换日期时保留这些节点，只更新标题并替换其中的事件
+function timeGridSkeleton(grid, dayCount, headerClass) {
+    const skeleton = timeGridSkeletons.get(grid);
+    if (skeleton && skeleton.timeColumn.parentNode === grid) {
+        return skeleton;
+    }
+    
+    grid.textContent = ''; // 清空内容
+    
+    // 先在文档片段中构建整个结构，最后一次性插入，避免每次追加节点都触发重排
+    const frag = document.createDocumentFragment();
     
     // 创建时间轴标签列
     const timeColumn = document.createElement('div');
@@ -777,7 +1337,7 @@ function renderWeekView() {
     
     // 添加空白头部单元格
     const emptyHeader = document.createElement('div');
-    emptyHeader.className = 'week-day-header';
+    emptyHeader.className = headerClass;
     timeColumn.appendChild(emptyHeader);
     
     // 添加时间标签
@@ -785,299 +1345,123 @@ function renderWeekView() {
         const timeLabel = document.createElement('div');
         timeLabel.className = 'time-label';
         timeLabel.textContent = `${hour}:00`;
-        timeLabel.style.position = 'absolute';
-        timeLabel.style.top = `${hour * 40 + 30}px`;
+        timeLabel.style.cssText = `--top: ${hour * 40 + 30}px`;
         timeColumn.appendChild(timeLabel);
     }
     
-    weekGrid.appendChild(timeColumn);
+    frag.appendChild(timeColumn);
     
-    // 获取当前周的起始日期（周日）
-    const startOfWeek = new Date(currentDate);
-    startOfWeek.setDate(currentDate.getDate() - currentDate.getDay());
-    
-    // 创建每一天的列
+    // 创建每一天的列及其标题
     const dayColumns = [];
-    const dayDates = [];
-    
-    for (let i = 0; i < 7; i++) {
-        const dayDate = new Date(startOfWeek);
-        dayDate.setDate(startOfWeek.getDate() + i);
-        const dateStr = formatDate(dayDate);
-        dayDates.push(dateStr);
-        
+    const headers = [];
+    for (let i = 0; i < dayCount; i++) {
         const dayColumn = document.createElement('div');
         dayColumn.className = 'day-column';
         
-        // 添加日期标题
         const dayHeader = document.createElement('div');
-        dayHeader.className = 'week-day-header';
-        dayHeader.textContent = `${dayDate.getMonth() + 1}/${dayDate.getDate()} ${['周日', '周一', '周二', '周三', '周四', '周五', '周六'][dayDate.getDay()]}`;
+        dayHeader.className = headerClass;
         dayColumn.appendChild(dayHeader);
         
-        // 添加时间背景网格线
-        for (let hour = 0; hour < 24; hour++) {
-            const hourLine = document.createElement('div');
-            hourLine.className = 'hour-line';
-            hourLine.style.position = 'absolute';
-            hourLine.style.left = '0';
-            hourLine.style.right = '0';
-            hourLine.style.top = `${hour * 40 + 30}px`;
-            hourLine.style.height = '1px';
-            hourLine.style.backgroundColor = '#eee';
-            hourLine.style.zIndex = '1';
-            dayColumn.appendChild(hourLine);
-        }
-        
         dayColumns.push(dayColumn);
-        weekGrid.appendChild(dayColumn);
+        headers.push(dayHeader);
+        frag.appendChild(dayColumn);
     }
     
-    // 分两步处理事件：
-    // 1. 处理当前周内的事件
-    // 2. 处理前一天的跨天事件
+    grid.appendChild(frag);
     
-    // 第一步：处理当前周内的事件
-    console.log("处理当前周内的事件");
-    events.forEach(event => {
-        // 检查事件日期是否在当前周内
-        const dateIndex = dayDates.indexOf(event.date);
-        if (dateIndex === -1) return; // 如果不在当前周内，跳过
-        
-        // 检查是否是跨天事件
-        const isOvernight = isOvernightEvent(event.time_range);
-        
-        // 在当天显示事件
-        const currentDayTimeRange = isOvernight ? getCurrentDayTimeRange(event.time_range) : event.time_range;
-        const currentDayPosition = calculateEventPosition(currentDayTimeRange);
-        
-        if (currentDayPosition) {
-            // 使用renderEventItem函数创建事件元素
-            const eventStyle = {
-                position: 'absolute',
-                top: `${currentDayPosition.top}px`,
-                left: '5px',
-                right: '5px',
-                height: `${currentDayPosition.height}px`,
-                zIndex: '2'
-            };
-            
-            // 设置事件显示内容
-            const eventOptions = {
-                style: eventStyle,
-                customContent: `${event.time_range}: ${event.title}`
-            };
-            
-            renderEventItem(event, dayColumns[dateIndex], eventOptions);
-        }
-        
-        // 如果是跨天事件，且次日也在当前周内，则在次日也显示事件
-        if (isOvernight && dateIndex < 6) {
-            const nextDayTimeRange = getNextDayTimeRange(event.time_range);
-            const nextDayPosition = calculateEventPosition(nextDayTimeRange);
-            
-            if (nextDayPosition) {
-                // 使用renderEventItem函数创建次日事件元素
-                const nextDayStyle = {
-                    position: 'absolute',
-                    top: `${nextDayPosition.top}px`,
-                    left: '5px',
-                    right: '5px',
-                    height: `${nextDayPosition.height}px`,
-                    zIndex: '2'
-                };
-                
-                // 设置次日事件显示内容
-                const nextDayOptions = {
-                    style: nextDayStyle,
-                    customContent: `(续) ${event.title}`
-                };
-                
-                renderEventItem(event, dayColumns[dateIndex + 1], nextDayOptions);
-            }
-        }
-    });
-    
-    // 第二步：处理前一天的跨天事件（特别是周六到周日的跨天事件）
-    console.log("处理前一天的跨天事件");
-    events.forEach(event => {
-        // 检查是否是跨天事件
-        if (!isOvernightEvent(event.time_range)) return;
-        
-        // 计算事件的次日
-        const eventDate = new Date(event.date);
-        eventDate.setDate(eventDate.getDate() + 1);
-        const nextDateStr = formatDate(eventDate);
-        
-        // 检查次日是否在当前周内
-        const nextDateIndex = dayDates.indexOf(nextDateStr);
-        if (nextDateIndex === -1) return; // 如果次日不在当前周内，跳过
-        
-        // 获取次日的时间范围
-        const nextDayTimeRange = getNextDayTimeRange(event.time_range);
-        const position = calculateEventPosition(nextDayTimeRange);
-        
-        if (position) {
-            // 使用renderEventItem函数创建次日事件元素
-            const nextDayStyle = {
-                position: 'absolute',
-                top: `${position.top}px`,
-                left: '5px',
-                right: '5px',
-                height: `${position.height}px`,
-                zIndex: '2'
-            };
-            
-            // 设置次日事件显示内容
-            const nextDayOptions = {
-                style: nextDayStyle,
-                customContent: `(续) ${event.title}`
-            };
-            
-            renderEventItem(event, dayColumns[nextDateIndex], nextDayOptions);
-        }
-    });
-    
-    // 添加当前时间指示线
-    addCurrentTimeIndicator();
+    const built = { timeColumn, dayColumns, headers };
+    timeGridSkeletons.set(grid, built);
+    return built;
 }
 
-// 渲染日视图
-function renderDayView() {
-    const dayGrid = document.getElementById('day-grid');
-    dayGrid.innerHTML = ''; // 清空内容
-    
-    // 创建时间轴标签列
-    const timeColumn = document.createElement('div');
-    timeColumn.className = 'time-column';
+// 渲染周视图
+function renderWeekView(eventsIndex) {
+    const weekGrid = el.weekGrid;
+    const { dayColumns, headers } = timeGridSkeleton(weekGrid, 7, 'week-day-header');
     
-    // 添加空白头部单元格
-    const emptyHeader = document.createElement('div');
-    emptyHeader.className = 'day-header';
-    timeColumn.appendChild(emptyHeader);
+    // 获取当前周的起始日期（周日）
+    const startOfWeek = new Date(currentDate);
+    startOfWeek.setDate(currentDate.getDate() - currentDate.getDay());
     
-    // 添加时间标签
-    for (let hour = 0; hour < 24; hour++) {
-        const timeLabel = document.createElement('div');
-        timeLabel.className = 'time-label';
-        timeLabel.textContent = `${hour}:00`;
-        timeLabel.style.position = 'absolute';
-        timeLabel.style.top = `${hour * 40 + 30}px`;
-        timeColumn.appendChild(timeLabel);
+    // 更新每一天的日期标题
+    const dayDates = [];
+    for (let i = 0; i < 7; i++) {
+        const dayDate = new Date(startOfWeek);
+        dayDate.setDate(startOfWeek.getDate() + i);
+        dayDates.push(formatDate(dayDate));
+        headers[i].textContent = `${dayDate.getMonth() + 1}/${dayDate.getDate()} ${WEEKDAY_NAMES[i]}`;
     }
     
-    dayGrid.appendChild(timeColumn);
-    
-    // 创建当天的列
-    const dayColumn = document.createElement('div');
-    dayColumn.className = 'day-column';
+    // 事件放在所在日期的列中，跨天事件的次日部分放在下一列；
+    // 前一天的跨天事件只显示次日部分（例如上周六到本周日）
+    const prevDay = new Date(startOfWeek);
+    prevDay.setDate(startOfWeek.getDate() - 1);
+    const columnDates = [formatDate(prevDay), ...dayDates];
+    const columns = [null, ...dayColumns];
+    let targets = columns;
+    
+    currentViewPlan = timeGridPlan(
+        weekGrid,
+        index => columnDates.flatMap((dateStr, i) => (i === 0 ? overnightEventsByDate : index)[dateStr] || []),
+        event => {
+            const dateIndex = columnDates.indexOf(event.date);
+            return placeTimedEvent(event, targets[dateIndex], targets[dateIndex + 1]);
+        }
+    );
     
-    // 添加日期标题
-    const dayHeader = document.createElement('div');
-    dayHeader.className = 'day-header';
-    dayHeader.textContent = `${currentDate.getFullYear()}年${currentDate.getMonth() + 1}月${currentDate.getDate()}日 ${['周日', '周一', '周二', '周三', '周四', '周五', '周六'][currentDate.getDay()]}`;
-    dayColumn.appendChild(dayHeader);
+    // 首次放置的事件先写入每列对应的文档片段，每列只插入一次；之后的增量更新直接放入列中
+    targets = columns.map(column => column && document.createDocumentFragment());
+    currentViewPlan.collect(eventsIndex).forEach(placeViewEvent);
+    columns.forEach((column, i) => column && column.appendChild(targets[i]));
+    targets = columns;
     
-    // 添加时间背景网格线
-    for (let hour = 0; hour < 24; hour++) {
-        const hourLine = document.createElement('div');
-        hourLine.className = 'hour-line';
-        hourLine.style.position = 'absolute';
-        hourLine.style.left = '0';
-        hourLine.style.right = '0';
-        hourLine.style.top = `${hour * 40 + 30}px`;
-        hourLine.style.height = '1px';
-        hourLine.style.backgroundColor = '#eee';
-        hourLine.style.zIndex = '1';
-        dayColumn.appendChild(hourLine);
-    }
+    // 本周包含今天时在今天的列中显示当前时间指示线
+    addCurrentTimeIndicator(dayColumns[dayDates.indexOf(formatDate(new Date()))]);
+}
+
+// 渲染日视图
+function renderDayView(eventsIndex) {
+    const dayGrid = el.dayGrid;
+    const { dayColumns, headers } = timeGridSkeleton(dayGrid, 1, 'day-header');
+    const dayColumn = dayColumns[0];
     
-    dayGrid.appendChild(dayColumn);
+    // 更新日期标题
+    headers[0].textContent = `${currentDate.getFullYear()}年${currentDate.getMonth() + 1}月${currentDate.getDate()}日 ${WEEKDAY_NAMES[currentDate.getDay()]}`;
     
-    // 获取当前日期的格式化字符串
+    // 获取当前日期和前一天的格式化字符串
     const currentDateStr = formatDate(currentDate);
-    
-    // 获取当前日期的事件
-    const dayEvents = events.filter(event => event.date === currentDateStr);
-    
-    // 添加当天的事件
-    dayEvents.forEach(event => {
-        // 检查是否是跨天事件
-        const isOvernight = isOvernightEvent(event.time_range);
-        
-        // 获取当天的时间范围
-        const currentDayTimeRange = isOvernight ? getCurrentDayTimeRange(event.time_range) : event.time_range;
-        const position = calculateEventPosition(currentDayTimeRange);
-        
-        if (position) {
-            // 使用renderEventItem函数创建事件元素
-            const eventStyle = {
-                position: 'absolute',
-                top: `${position.top}px`,
-                left: '5px',
-                right: '5px',
-                height: `${position.height}px`,
-                zIndex: '2'
-            };
-            
-            // 设置事件显示内容
-            const eventOptions = {
-                style: eventStyle,
-                customContent: `${event.time_range}: ${event.title}`
-            };
-            
-            renderEventItem(event, dayColumn, eventOptions);
-        }
-    });
-    
-    // 获取前一天的日期
     const prevDate = new Date(currentDate);
     prevDate.setDate(currentDate.getDate() - 1);
     const prevDateStr = formatDate(prevDate);
     
-    // 获取前一天的事件
-    const prevDayEvents = events.filter(event => event.date === prevDateStr);
-    
-    // 添加前一天跨天的事件
-    prevDayEvents.forEach(event => {
-        // 检查是否是跨天事件
-        const isOvernight = isOvernightEvent(event.time_range);
-        
-        if (isOvernight) {
-            // 获取次日的时间范围
-            const nextDayTimeRange = getNextDayTimeRange(event.time_range);
-            const position = calculateEventPosition(nextDayTimeRange);
-            
-            if (position) {
-                // 使用renderEventItem函数创建次日事件元素
-                const nextDayStyle = {
-                    position: 'absolute',
-                    top: `${position.top}px`,
-                    left: '5px',
-                    right: '5px',
-                    height: `${position.height}px`,
-                    zIndex: '2'
-                };
-                
-                // 设置次日事件显示内容
-                const nextDayOptions = {
-                    style: nextDayStyle,
-                    customContent: `(续) ${event.title}`
-                };
-                
-                renderEventItem(event, dayColumn, nextDayOptions);
-            }
-        }
-    });
-    
-    // 添加当前时间指示线
-    addCurrentTimeIndicator();
+    // 当天的事件放在列中，前一天的跨天事件只显示次日部分
+    let target = dayColumn;
+    currentViewPlan = timeGridPlan(
+        dayGrid,
+        index => (overnightEventsByDate[prevDateStr] || []).concat(index[currentDateStr] || []),
+        event => event.date === currentDateStr
+            ? placeTimedEvent(event, target, null)
+            : placeTimedEvent(event, null, target)
+    );
+    
+    // 首次放置的事件先写入文档片段，一次插入列中；之后的增量更新直接放入列中
+    target = document.createDocumentFragment();
+    currentViewPlan.collect(eventsIndex).forEach(placeViewEvent);
+    dayColumn.appendChild(target);
+    target = dayColumn;
+    
+    // 显示的是今天时添加当前时间指示线
+    addCurrentTimeIndicator(currentDateStr === formatDate(new Date()) ? dayColumn : null);
 }
 
 // 渲染列表视图
 function renderListView() {
-    const listGrid = document.getElementById('list-grid');
-    listGrid.innerHTML = ''; // 清空内容
+    const listGrid = el.listGrid;
+    listGrid.textContent = ''; // 清空内容
+    listViewport = null;
+    listRows = [];
+    listRowOffsets = [];
+    listRowPool = [];
     
     // 创建标题
     const header = document.createElement('h2');
@@ -1093,149 +1477,253 @@ function renderListView() {
         return;
     }
     
-    // 按日期分组
-    const eventsByDate = {};
+    // 事件在加载时已按日期和开始时间排序，顺序展开为日期标题行和事件行，并计算每行的纵向位置
+    let offset = 0;
+    let lastDate = null;
     events.forEach(event => {
-        if (!eventsByDate[event.date]) {
-            eventsByDate[event.date] = [];
+        if (event.date !== lastDate) {
+            lastDate = event.date;
+            listRows.push({ type: 'date', date: event.date });
+            listRowOffsets.push(offset);
+            offset += LIST_DATE_ROW_HEIGHT;
         }
-        eventsByDate[event.date].push(event);
-    });
-    
-    // 按日期排序
-    const sortedDates = Object.keys(eventsByDate).sort();
-    
-    // 创建日期分组列表
-    sortedDates.forEach(date => {
-        const dateGroup = document.createElement('div');
-        dateGroup.className = 'date-group';
-        
-        // 创建日期标题
-        const dateHeader = document.createElement('h3');
-        const dateObj = parseDate(date);
-        dateHeader.textContent = `${date} ${['周日', '周一', '周二', '周三', '周四', '周五', '周六'][dateObj.getDay()]}`;
-        dateGroup.appendChild(dateHeader);
-        
-        // 创建事件列表
-        const eventsList = document.createElement('div');
-        eventsList.className = 'events-list';
-        
-        // 按时间排序
-        eventsByDate[date].sort((a, b) => {
-            // 提取开始时间
-            const getStartTime = (timeRange) => {
-                const parts = timeRange.split('-');
-                return parts[0].trim();
-            };
-            
-            const aStart = getStartTime(a.time_range);
-            const bStart = getStartTime(b.time_range);
-            
-            return aStart.localeCompare(bStart);
-        });
-        
-        // 添加事件
-        eventsByDate[date].forEach(event => {
-            renderEventItem(event, eventsList, { showTimeRange: true });
-        });
         
-        dateGroup.appendChild(eventsList);
-        listGrid.appendChild(dateGroup);
+        listRows.push({ type: 'event', event: event });
+        listRowOffsets.push(offset);
+        offset += LIST_EVENT_ROW_HEIGHT;
     });
+    
+    // 占位容器撑开总高度以保持滚动条的长度和位置
+    listViewport = document.createElement('div');
+    listViewport.className = 'list-virtual-viewport';
+    listViewport.style.height = `${offset}px`;
+    listGrid.appendChild(listViewport);
+    
+    // 行节点池的大小足以覆盖一屏加上下缓冲区，按行号取模分配节点，
+    // 仍在可见范围内的行不会被重新生成
+    const container = el.calendarContainer;
+    const poolSize = Math.ceil((container.clientHeight + LIST_BUFFER_PX * 2) / Math.min(LIST_DATE_ROW_HEIGHT, LIST_EVENT_ROW_HEIGHT)) + 2;
+    for (let i = 0; i < poolSize; i++) {
+        const row = document.createElement('div');
+        row.className = 'list-virtual-row';
+        row.hidden = true;
+        listRowPool.push(row);
+        listViewport.appendChild(row);
+    }
+    
+    updateListWindow();
 }
 
-// 显示事件详情
-function showEventDetails(event) {
-    const detailsContainer = document.getElementById('event-details');
-    const detailsContent = document.getElementById('event-details-content');
-    
-    // 清空内容
-    detailsContent.innerHTML = '';
+// 滚动时在下一帧更新列表视图的可见行，同一帧内的多次滚动只处理一次
+function scheduleListWindowUpdate() {
+    if (currentView !== 'list' || !listViewport || listScrollFrame !== null) {
+        return;
+    }
     
-    // 创建详情内容
-    const details = [
-        `<strong>事项:</strong> ${event.title}`,
-        `<strong>日期:</strong> ${event.date}`,
-        `<strong>时间段:</strong> ${event.time_range}`,
-        `<strong>类型:</strong> ${event.event_type}`
-    ];
+    listScrollFrame = requestAnimationFrame(function() {
+        listScrollFrame = null;
+        updateListWindow();
+    });
+}
+
+// 只渲染与可见区域（含上下缓冲）相交的行
+function updateListWindow() {
+    if (!listViewport || !listViewport.isConnected) {
+        return;
+    }
     
-    // 添加可选字段
-    if (event.deadline) {
-        details.push(`<strong>截止日期:</strong> ${event.deadline}`);
+    const container = el.calendarContainer;
+    const viewportTop = listViewport.getBoundingClientRect().top - container.getBoundingClientRect().top;
+    const visibleStart = -viewportTop - LIST_BUFFER_PX;
+    const visibleEnd = -viewportTop + container.clientHeight + LIST_BUFFER_PX;
+    
+    // 二分查找第一个底部位于可见区域起点之后的行
+    let low = 0;
+    let high = listRows.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        const rowHeight = listRows[mid].type === 'date' ? LIST_DATE_ROW_HEIGHT : LIST_EVENT_ROW_HEIGHT;
+        if (listRowOffsets[mid] + rowHeight <= visibleStart) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
     }
     
-    if (event.importance) {
-        details.push(`<strong>重要程度:</strong> ${event.importance}`);
+    const used = new Set();
+    for (let i = low; i < listRows.length && listRowOffsets[i] < visibleEnd; i++) {
+        const slot = i % listRowPool.length;
+        if (used.has(slot)) break;
+        used.add(slot);
+        fillListRow(listRowPool[slot], i);
     }
     
-    if (event.description) {
-        details.push(`<strong>描述:</strong> ${event.description}`);
+    // 隐藏本次未使用的节点
+    listRowPool.forEach((row, slot) => {
+        if (!used.has(slot)) {
+            row.hidden = true;
+        }
+    });
+}
+
+// 将行节点更新为第index行的内容，节点已显示该行时不做任何修改
+function fillListRow(row, index) {
+    row.hidden = false;
+    if (row.dataset.rowIndex === String(index)) {
+        return;
+    }
+    row.dataset.rowIndex = index;
+    row.style.transform = `translateY(${listRowOffsets[index]}px)`;
+    
+    const item = listRows[index];
+    if (item.type === 'date') {
+        row.className = 'list-virtual-row list-date-header';
+        row.style.height = `${LIST_DATE_ROW_HEIGHT}px`;
+        row.textContent = dateHeading(item.date);
+    } else {
+        row.className = 'list-virtual-row list-event-row';
+        row.style.height = `${LIST_EVENT_ROW_HEIGHT}px`;
+        row.textContent = '';
+        renderEventItem(item.event, row, { showTimeRange: true });
     }
+}
+
+// 详情面板中显示的字段：[键, 标签, 是否可选]，可选字段没有值时隐藏所在行
+const DETAILS_FIELDS = [
+    ['title', '事项', false],
+    ['date', '日期', false],
+    ['time_range', '时间段', false],
+    ['event_type', '类型', false],
+    ['deadline', '截止日期', true],
+    ['importance', '重要程度', true],
+    ['description', '描述', true],
+    ['status', '状态', false],
+    ['completion_date', '完成时间', true],
+    ['actual_time_range', '实际发生时间', true],
+    ['completion_notes', '完成备注', true],
+    ['reflection_notes', '复盘笔记', true]
+];
+// 详情面板的固定结构只在首次显示时创建，之后只更新各字段的文本
+let detailsSlots = null;
+
+// 创建详情面板的字段行和操作按钮，返回各字段的行、值节点和按钮
+function getDetailsSlots() {
+    if (detailsSlots) return detailsSlots;
     
-    // 添加完成状态
-    const isCompleted = event.is_completed === true;
-    details.push(`<strong>状态:</strong> ${isCompleted ? '已完成' : '未完成'}`);
+    const detailsContent = document.getElementById('event-details-content');
+    detailsContent.textContent = '';
+    detailsSlots = { fields: {} };
+    
+    DETAILS_FIELDS.forEach(([key, label]) => {
+        const row = document.createElement('div');
+        const name = document.createElement('strong');
+        name.textContent = `${label}:`;
+        const value = document.createElement('span');
+        row.append(name, ' ', value);
+        detailsContent.appendChild(row);
+        detailsSlots.fields[key] = { row, value };
+    });
     
-    // 如果是已完成事件，显示完成时间和备注
-    if (isCompleted && event.completion_date) {
-        details.push(`<strong>完成时间:</strong> ${event.completion_date}`);
-    }
+    // 已完成事件显示删除按钮，未完成事件显示标记为已完成按钮
+    detailsSlots.deleteButton = document.createElement('button');
+    detailsSlots.deleteButton.className = 'action-button delete-button';
+    detailsSlots.deleteButton.textContent = '删除事件';
+    detailsSlots.deleteButton.dataset.action = 'delete';
     
-    // 如果是已完成事件，显示实际发生时间范围
-    if (isCompleted && event.actual_time_range) {
-        details.push(`<strong>实际发生时间:</strong> ${event.actual_time_range}`);
-    }
+    detailsSlots.completeButton = document.createElement('button');
+    detailsSlots.completeButton.className = 'action-button complete-button';
+    detailsSlots.completeButton.textContent = '标记为已完成';
+    detailsSlots.completeButton.dataset.action = 'complete';
     
-    if (isCompleted && event.completion_notes) {
-        details.push(`<strong>完成备注:</strong> ${event.completion_notes}`);
-    }
+    detailsContent.append(detailsSlots.deleteButton, detailsSlots.completeButton);
+    return detailsSlots;
+}
+
+// 显示事件详情
+function showEventDetails(event) {
+    const detailsContainer = el.eventDetails;
+    const slots = getDetailsSlots();
+    
+    // 完成时间、实际发生时间和备注只对已完成事件显示
+    const isCompleted = Boolean(event.is_completed);
+    const values = {
+        title: event.title,
+        date: event.date,
+        time_range: event.time_range,
+        event_type: event.event_type,
+        deadline: event.deadline,
+        importance: event.importance,
+        description: event.description,
+        status: isCompleted ? '已完成' : '未完成',
+        completion_date: isCompleted && event.completion_date,
+        actual_time_range: isCompleted && event.actual_time_range,
+        completion_notes: isCompleted && event.completion_notes,
+        reflection_notes: isCompleted && event.reflection_notes
+    };
     
-    if (isCompleted && event.reflection_notes) {
-        details.push(`<strong>复盘笔记:</strong> ${event.reflection_notes}`);
-    }
+    // 只修改文本内容，不重新解析HTML
+    DETAILS_FIELDS.forEach(([key, , optional]) => {
+        const field = slots.fields[key];
+        if (!field.row.classList.toggle('hidden', optional && !values[key])) {
+            field.value.textContent = values[key];
+        }
+    });
     
-    // 设置内容
-    detailsContent.innerHTML = details.join('<br>');
+    // 记录当前详情面板对应的事件，按钮点击由详情面板上的委托监听器处理
+    detailsEvent = event;
     
-    // 根据事件来源添加不同的按钮
-    if (isCompleted) {
-        // 已完成事件 - 添加删除按钮
-        const deleteButton = document.createElement('button');
-        deleteButton.className = 'action-button delete-button';
-        deleteButton.textContent = '删除事件';
-        deleteButton.addEventListener('click', function() {
-            // 直接调用删除函数，不显示确认对话框
-            deleteCompletedTask(event.id);
-        });
-        detailsContent.appendChild(document.createElement('br'));
-        detailsContent.appendChild(deleteButton);
-    } else {
-        // 未完成事件 - 添加标记为已完成按钮
-        const completeButton = document.createElement('button');
-        completeButton.className = 'action-button complete-button';
-        completeButton.textContent = '标记为已完成';
-        completeButton.addEventListener('click', function() {
-            markEventCompleted(event.id, event.date);
-        });
-        detailsContent.appendChild(document.createElement('br'));
-        detailsContent.appendChild(completeButton);
-    }
+    // 根据事件是否已完成显示不同的按钮
+    slots.deleteButton.classList.toggle('hidden', !isCompleted);
+    slots.completeButton.classList.toggle('hidden', isCompleted);
     
     // 显示详情面板
     detailsContainer.classList.remove('hidden');
 }
 
+// 详情面板的委托点击处理
+function handleDetailsClick(e) {
+    const button = e.target.closest('button[data-action]');
+    if (!button || !detailsEvent) return;
+    
+    if (button.dataset.action === 'delete') {
+        // 直接调用删除函数，不显示确认对话框
+        deleteCompletedTask(detailsEvent);
+    } else if (button.dataset.action === 'complete') {
+        markEventCompleted(detailsEvent);
+    }
+}
+
+// 已完成视图的委托点击处理
+function handleCompletedGridClick(e) {
+    const eventItem = e.target.closest('.event-item');
+    if (!eventItem) return;
+    
+    const event = completedEventMap.get(eventItem.dataset.eventId);
+    if (!event) return;
+    
+    const button = e.target.closest('button[data-action]');
+    if (button) {
+        if (button.dataset.action === 'delete') {
+            handleDeleteButtonClick(event, eventItem, button);
+        }
+        return;
+    }
+    
+    showEventDetails(event);
+}
+
 // 删除已完成任务
-function deleteCompletedTask(taskId) {
-    // 如果该任务正在处理中，则忽略请求
-    if (processingEvents.has(taskId)) {
-        console.log(`事件 ${taskId} 正在处理中，忽略删除请求`);
+function deleteCompletedTask(task) {
+    const taskId = task.id;
+    
+    // 如果该任务正在处理中或已被删除，则忽略请求
+    if (task._status) {
+        console.log(`事件 ${taskId} 正在处理或已经处理完成，忽略删除请求`);
         return;
     }
     
-    // 将任务ID添加到处理集合中
-    processingEvents.add(taskId);
+    // 标记为正在处理
+    task._status = 'processing';
     console.log(`开始处理事件 ${taskId} 的删除操作`);
     
     // 立即从界面上移除该事件（视觉反馈）
@@ -1262,7 +1750,7 @@ function deleteCompletedTask(taskId) {
     });
     
     // 关闭详情面板
-    document.getElementById('event-details').classList.add('hidden');
+    el.eventDetails.classList.add('hidden');
     
     fetch(`/api/completed-tasks/${taskId}`, {
         method: 'DELETE'
@@ -1272,11 +1760,12 @@ function deleteCompletedTask(taskId) {
         return response.json();
     })
     .then(data => {
-        // 从处理集合中移除任务ID
-        processingEvents.delete(taskId);
         console.log(`事件 ${taskId} 的删除操作已完成，结果: ${data.status}`);
         
         if (data.status === 'success') {
+            task._status = 'completed';
+            invalidateEventsCache();
+            
             // 显示成功消息
             showNotification('任务已成功删除');
             
@@ -1292,16 +1781,14 @@ function deleteCompletedTask(taskId) {
                 }
             }, 500);
         } else {
-            // 处理失败，从已处理完成集合中移除事件ID
-            completedEvents.delete(taskId);
+            // 处理失败，恢复空闲状态
+            delete task._status;
             alert('删除任务失败: ' + data.message);
         }
     })
     .catch(error => {
-        // 从处理集合中移除任务ID
-        processingEvents.delete(taskId);
-        // 处理失败，从已处理完成集合中移除事件ID
-        completedEvents.delete(taskId);
+        // 处理失败，恢复空闲状态
+        delete task._status;
         
         console.error(`事件 ${taskId} 删除出错:`, error);
         alert('删除任务时发生错误');
@@ -1332,175 +1819,32 @@ function showNotification(message, type = 'success') {
     }, 3000);
 }
 
-// 标记事件为已完成或未完成
-function markEventCompleted(eventId, completed) {
-    // 如果该事件已经处理完成，则忽略请求
-    if (completedEvents.has(eventId)) {
-        console.log(`事件 ${eventId} 已经处理完成，忽略重复请求`);
-        return;
-    }
-    
-    // 如果该事件正在处理中，则忽略请求
-    if (processingEvents.has(eventId)) {
-        console.log(`事件 ${eventId} 正在处理中，忽略重复请求`);
-        return;
-    }
-    
-    // 将事件ID添加到处理集合中
-    processingEvents.add(eventId);
-    console.log(`开始处理事件 ${eventId} 的完成状态变更`);
-    
-    // 立即从界面上标记该事件（视觉反馈）
-    const eventElements = document.querySelectorAll(`.event-item[data-event-id="${eventId}"]`);
-    eventElements.forEach(element => {
-        // 获取日期，用于区分周期性事件的特定实例
-        const eventDate = element.dataset.date;
-        
-        // 如果是今天标记为已完成的事件，则添加特殊效果
-        element.classList.add('completing');
-        element.style.opacity = '0.3';
-        element.style.pointerEvents = 'none';
-        element.style.transition = 'all 0.5s ease';
-        element.style.transform = 'translateX(100%)';
-        
-        // 禁用所有按钮
-        const buttons = element.querySelectorAll('button');
-        buttons.forEach(button => {
-            button.disabled = true;
-            button.textContent = '...';
-        });
-        
-        // 500ms后完全移除事件元素
-        setTimeout(() => {
-            if (element.parentNode) {
-                element.parentNode.removeChild(element);
-            }
-        }, 500);
-    });
-    
-    // 关闭详情面板
-    document.getElementById('event-details').classList.add('hidden');
-    
-    // 将事件ID添加到已处理完成集合中，防止重复处理
-    completedEvents.add(eventId);
-    
-    // 添加当前日期信息到请求中，用于处理周期性事件
-    const currentDateStr = formatDate(new Date());
-    const eventDate = document.querySelector(`.event-item[data-event-id="${eventId}"]`)?.dataset.date || currentDateStr;
-    
-    fetch(`/api/events/${eventId}/complete`, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({ 
-            completed: completed,
-            date: eventDate // 添加日期信息
-        })
-    })
-    .then(response => {
-        console.log(`事件 ${eventId} 的请求已发送，状态码: ${response.status}`);
-        return response.json();
-    })
-    .then(data => {
-        // 从处理集合中移除事件ID
-        processingEvents.delete(eventId);
-        console.log(`事件 ${eventId} 的处理已完成，结果: ${data.status}`);
-        
-        if (data.status === 'success') {
-            // 显示成功消息
-            showNotification('事件已标记为已完成');
-            
-            // 延迟一段时间后重新加载事件，确保后端处理完成
-            setTimeout(() => {
-                // 重新加载事件
-                loadEvents();
-                // 刷新已完成任务列表
-                renderCompletedView();
-            }, 700);
-        } else {
-            // 处理失败，从已处理完成集合中移除事件ID
-            completedEvents.delete(eventId);
-            alert('更新事件状态失败: ' + data.message);
-            
-            // 恢复界面上的事件元素
-            const eventElements = document.querySelectorAll(`.event-item.completing`);
-            eventElements.forEach(element => {
-                element.classList.remove('completing');
-                element.style.opacity = '1';
-                element.style.pointerEvents = 'auto';
-                element.style.transform = 'translateX(0)';
-                
-                // 恢复按钮状态
-                const completeButton = element.querySelector('.complete-button');
-                if (completeButton) {
-                    completeButton.disabled = false;
-                    completeButton.textContent = '○';
-                }
-            });
-        }
-    })
-    .catch(error => {
-        // 从处理集合中移除事件ID
-        processingEvents.delete(eventId);
-        // 处理失败，从已处理完成集合中移除事件ID
-        completedEvents.delete(eventId);
-        
-        console.error(`事件 ${eventId} 处理出错:`, error);
-        alert('更新事件状态时发生错误');
-        
-        // 恢复界面上的事件元素
-        const eventElements = document.querySelectorAll(`.event-item.completing`);
-        eventElements.forEach(element => {
-            element.classList.remove('completing');
-            element.style.opacity = '1';
-            element.style.pointerEvents = 'auto';
-            element.style.transform = 'translateX(0)';
-            
-            // 恢复按钮状态
-            const completeButton = element.querySelector('.complete-button');
-            if (completeButton) {
-                completeButton.disabled = false;
-                completeButton.textContent = '○';
-            }
-        });
-    });
-}
-
-// LLM查询相关功能
+// LLM查询相关功能（LLM相关按钮在 BUTTON_ACTIONS 中统一处理）
 document.addEventListener('DOMContentLoaded', function() {
-    // 绑定LLM视图按钮
-    document.getElementById('llm-view').addEventListener('click', function() {
-        switchView('llm');
-    });
-    
-    // 重复设置下拉框变化事件
+    // 重复设置下拉框变化事件，仅在显示状态真正变化时修改样式类
+    const endDateContainer = document.getElementById('end-date-container');
+    let lastRecurrenceHidden = endDateContainer.classList.contains('hidden');
     document.getElementById('recurrence').addEventListener('change', function() {
-        const endDateContainer = document.getElementById('end-date-container');
-        if (this.value) {
-            endDateContainer.classList.remove('hidden');
-        } else {
-            endDateContainer.classList.add('hidden');
-        }
+        const shouldHide = !this.value;
+        if (shouldHide === lastRecurrenceHidden) return;
+        lastRecurrenceHidden = shouldHide;
+        endDateContainer.classList.toggle('hidden', shouldHide);
     });
     
     // 确保加载指示器初始状态为隐藏
-    const loadingIndicator = document.getElementById('loading-indicator');
+    const loadingIndicator = el.loadingIndicator;
     if (loadingIndicator) {
         loadingIndicator.classList.add('hidden');
     }
-    
-    // 提交LLM查询
-    document.getElementById('submit-llm').addEventListener('click', submitLLMQuery);
-    
-    // 新的查询按钮
-    document.getElementById('new-query').addEventListener('click', function() {
-        document.querySelector('.llm-form').classList.remove('hidden');
-        document.getElementById('llm-results').classList.add('hidden');
-        document.getElementById('llm-prompt').value = '';
-    });
 });
 
+// 新的查询：显示查询表单并清空输入
+function startNewLLMQuery() {
+    el.llmForm.classList.remove('hidden');
+    el.llmResults.classList.add('hidden');
+    document.getElementById('llm-prompt').value = '';
+}
+
 // 提交LLM查询
 function submitLLMQuery() {
     // 获取用户输入
@@ -1520,8 +1864,8 @@ function submitLLMQuery() {
     const showUnchanged = document.getElementById('show-unchanged').checked;
     
     // 显示加载指示器
-    document.getElementById('loading-indicator').classList.remove('hidden');
-    document.getElementById('submit-llm').disabled = true;
+    el.loadingIndicator.classList.remove('hidden');
+    el.submitLLM.disabled = true;
     
     // 准备请求数据
     const requestData = {
@@ -1536,96 +1880,180 @@ function submitLLMQuery() {
         query_type: document.querySelector('input[name="query_type"]:checked').value
     };
     
-    // 发送API请求
-    fetch('/api/llm-query', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify(requestData)
-    })
-    .then(response => response.json())
-    .then(data => {
-        // 隐藏加载指示器
-        document.getElementById('loading-indicator').classList.add('hidden');
-        document.getElementById('submit-llm').disabled = false;
-        
-        // 显示结果区域
-        document.querySelector('.llm-form').classList.add('hidden');
-        document.getElementById('llm-results').classList.remove('hidden');
-        
-        // 显示模型回复
-        document.getElementById('llm-response').textContent = data.response || '';
-        
-        // 显示处理摘要（如果有）
-        if (data.summary && showSummary) {
-            document.getElementById('summary-section').classList.remove('hidden');
-            document.getElementById('summary-content').textContent = data.summary;
-        } else {
-            document.getElementById('summary-section').classList.add('hidden');
-        }
-        
-        // 显示变更详情（如果有）
-        if (data.changes && showChanges) {
-            document.getElementById('changes-section').classList.remove('hidden');
-            document.getElementById('changes-content').textContent = data.changes;
-        } else {
-            document.getElementById('changes-section').classList.add('hidden');
-        }
-        
-        // 显示所有事件（如果需要）
-        if (data.events && showEvents) {
-            document.getElementById('events-section').classList.remove('hidden');
-            document.getElementById('events-content').textContent = data.events;
-        } else {
-            document.getElementById('events-section').classList.add('hidden');
-        }
-        
-        // 显示错误信息（如果有）
-        if (data.error) {
-            document.getElementById('error-section').classList.remove('hidden');
-            document.getElementById('error-content').textContent = data.error;
-        } else {
-            document.getElementById('error-section').classList.add('hidden');
-        }
-        
-        // 刷新事件数据
-        loadEvents();
-    })
-    .catch(error => {
-        // 隐藏加载指示器
-        document.getElementById('loading-indicator').classList.add('hidden');
-        document.getElementById('submit-llm').disabled = false;
-        
-        // 显示错误信息
-        document.getElementById('error-section').classList.remove('hidden');
-        document.getElementById('error-content').textContent = '请求失败: ' + error.message;
-        
-        console.error('LLM查询失败:', error);
+    // 在Web Worker中发送流式API请求并解析响应，避免大段JSON解析阻塞主线程
+    const options = { showSummary, showChanges, showEvents };
+    if (window.Worker) {
+        const worker = new Worker(document.body.dataset.llmWorkerUrl);
+        let streamStarted = false;
+        worker.onmessage = function(e) {
+            if (e.data.type === 'token') {
+                // 收到第一段输出时显示结果区域，之后逐段追加模型回复
+                if (!streamStarted) {
+                    streamStarted = true;
+                    startLLMStreamingResponse();
+                }
+                document.getElementById('llm-response').append(e.data.token);
+                return;
+            }
+            
+            worker.terminate();
+            if (e.data.type === 'done') {
+                handleLLMResponse(e.data.data, options);
+            } else {
+                handleLLMError(new Error(e.data.message));
+            }
+        };
+        worker.onerror = function(e) {
+            worker.terminate();
+            handleLLMError(new Error(e.message));
+        };
+        worker.postMessage({ url: '/api/llm-query-stream', body: requestData });
+    } else {
+        fetch('/api/llm-query', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(requestData)
+        })
+        .then(response => response.json())
+        .then(data => data.job_id ? pollLLMJob(data.job_id) : data)
+        .then(data => handleLLMResponse(data, options))
+        .catch(handleLLMError);
+    }
+}
+
+// LLM查询在后台执行，轮询任务状态直到返回最终结果
+function pollLLMJob(jobId) {
+    return fetch(`/api/llm-query/${jobId}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.status === 'error') {
+                throw new Error(data.message);
+            }
+            if (data.status !== 'pending') {
+                return data;
+            }
+            return new Promise(resolve => setTimeout(resolve, LLM_POLL_INTERVAL_MS))
+                .then(() => pollLLMJob(jobId));
+        });
+}
+
+// 开始接收流式输出：清空上一次的结果并显示结果区域
+function startLLMStreamingResponse() {
+    setTextOffDom('llm-response', '');
+    // 之后的输出片段直接追加到元素中，不再与记录的哈希值一致
+    textOffDomHashes.delete('llm-response');
+    el.llmResults.dataset.shown = '';
+    el.llmForm.classList.add('hidden');
+    el.llmResults.classList.remove('hidden');
+}
+
+// 处理LLM查询结果
+function handleLLMResponse(data, options) {
+    // 立即隐藏加载指示器并恢复提交按钮
+    el.loadingIndicator.classList.add('hidden');
+    el.submitLLM.disabled = false;
+    
+    // 结果内容在下一帧写入，事件数据等浏览器空闲时再刷新，避免与结果显示挤在同一帧中
+    invalidateEventsCache();
+    requestAnimationFrame(() => {
+        showLLMResults(data, options);
+        runWhenIdle(loadEvents);
     });
 }
 
+// 将LLM查询结果写入结果区域
+function showLLMResults(data, options) {
+    const { showSummary, showChanges, showEvents } = options;
+    
+    // 显示模型回复
+    setTextOffDom('llm-response', data.response || '');
+    
+    // 处理摘要、变更详情、所有事件和错误信息只在有内容（且选择显示）时写入
+    const shown = [
+        data.summary && showSummary && 'summary',
+        data.changes && showChanges && 'changes',
+        data.events && showEvents && 'events',
+        data.error && 'error'
+    ].filter(Boolean);
+    shown.forEach(name => {
+        setTextOffDom(`${name}-content`, data[name]);
+    });
+    
+    // 内容写入完成后再一次设置显示哪些区域并显示结果区域，合并为一次样式重算
+    el.llmResults.dataset.shown = shown.join(' ');
+    el.llmForm.classList.add('hidden');
+    el.llmResults.classList.remove('hidden');
+}
+
+// 在浏览器空闲时执行回调，不支持requestIdleCallback时退化为setTimeout
+function runWhenIdle(callback) {
+    if ('requestIdleCallback' in window) {
+        requestIdleCallback(() => callback(), { timeout: 1000 });
+    } else {
+        setTimeout(callback, 0);
+    }
+}
+
+// 处理LLM查询失败
+function handleLLMError(error) {
+    // 隐藏加载指示器
+    el.loadingIndicator.classList.add('hidden');
+    el.submitLLM.disabled = false;
+    
+    // 显示错误信息，其余区域保持原样
+    const shown = el.llmResults.dataset.shown.split(' ').filter(Boolean);
+    if (!shown.includes('error')) {
+        el.llmResults.dataset.shown = shown.concat('error').join(' ');
+    }
+    setTextOffDom('error-content', '请求失败: ' + error.message);
+    
+    console.error('LLM查询失败:', error);
+}
+
+// 计算字符串的32位FNV-1a哈希值
+function fnv1a(text) {
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return hash >>> 0;
+}
+
+// 在脱离文档的浅克隆上写入文本后整体替换，避免在可见元素上直接修改大段文本；
+// 与上次写入的内容相同（如重试同一查询）时不做任何修改
+function setTextOffDom(elementId, text) {
+    const textHash = `${text.length}:${fnv1a(text)}`;
+    if (textOffDomHashes.get(elementId) === textHash) return;
+    textOffDomHashes.set(elementId, textHash);
+    
+    const element = document.getElementById(elementId);
+    const clone = element.cloneNode(false);
+    clone.textContent = text;
+    element.replaceWith(clone);
+}
+
 // 添加已完成任务列表视图
 function renderCompletedView() {
     const completedGrid = document.getElementById('completed-grid');
-    completedGrid.innerHTML = ''; // 清空内容
     
-    // 创建标题
-    const header = document.createElement('h2');
-    header.textContent = '已完成任务';
-    completedGrid.appendChild(header);
+    // 创建标题（只在首次渲染时创建，之后的渲染在原有节点上增量更新）
+    let header = completedGrid.querySelector('h2');
+    if (!header) {
+        header = document.createElement('h2');
+        header.textContent = '已完成任务';
+        completedGrid.appendChild(header);
+    }
     
     // 加载已完成事件
     fetch('/api/events/completed')
         .then(response => response.json())
         .then(completedEvents => {
-            if (completedEvents.length === 0) {
-                const emptyMessage = document.createElement('p');
-                emptyMessage.className = 'empty-message';
-                emptyMessage.textContent = '暂无已完成任务';
-                completedGrid.appendChild(emptyMessage);
-                return;
-            }
+            // 移除上一次渲染留下的提示信息
+            completedGrid.querySelectorAll('.empty-message, .error-message').forEach(message => message.remove());
+            completedEventMap.clear();
             
             // 按日期分组
             const eventsByDate = {};
@@ -1633,36 +2061,71 @@ function renderCompletedView() {
                 if (!eventsByDate[event.date]) {
                     eventsByDate[event.date] = [];
                 }
+                // 确保事件有is_completed标志
+                event.is_completed = true;
+                completedEventMap.set(String(event.id), event);
                 eventsByDate[event.date].push(event);
             });
+            completedEventsByDate = eventsByDate;
             
             // 按日期排序（降序）
             const sortedDates = Object.keys(eventsByDate).sort().reverse();
             
-            // 创建日期分组列表
+            // 移除已不存在的日期分组
+            const wantedDates = new Set(sortedDates);
+            completedDateGroupNodes.forEach((dateGroup, date) => {
+                if (!wantedDates.has(date)) {
+                    if (completedGroupObserver) {
+                        completedGroupObserver.unobserve(dateGroup);
+                    }
+                    dateGroup.remove();
+                    completedDateGroupNodes.delete(date);
+                }
+            });
+            
+            if (completedEvents.length === 0) {
+                const emptyMessage = document.createElement('p');
+                emptyMessage.className = 'empty-message';
+                emptyMessage.textContent = '暂无已完成任务';
+                completedGrid.appendChild(emptyMessage);
+                return;
+            }
+            
+            // 只为视口附近的日期分组生成事件列表，其余分组先以占位元素呈现
+            if (!completedGroupObserver && 'IntersectionObserver' in window) {
+                completedGroupObserver = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (!entry.isIntersecting) return;
+                        completedGroupObserver.unobserve(entry.target);
+                        hydrateCompletedDateGroup(entry.target, completedEventsByDate[entry.target.dataset.date] || []);
+                    });
+                }, { rootMargin: '300px 0px' });
+            }
+            
+            // 按顺序复用或创建日期分组
+            let previous = header;
             sortedDates.forEach(date => {
-                const dateGroup = document.createElement('div');
-                dateGroup.className = 'date-group';
-                
-                // 创建日期标题
-                const dateHeader = document.createElement('h3');
-                const dateObj = parseDate(date);
-                dateHeader.textContent = `${date} ${['周日', '周一', '周二', '周三', '周四', '周五', '周六'][dateObj.getDay()]}`;
-                dateGroup.appendChild(dateHeader);
+                let dateGroup = completedDateGroupNodes.get(date);
                 
-                // 创建事件列表
-                const eventsList = document.createElement('div');
-                eventsList.className = 'events-list';
-                
-                // 添加事件
-                eventsByDate[date].forEach(event => {
-                    // 确保事件有is_completed标志
-                    event.is_completed = true;
-                    renderEventItem(event, eventsList, { showTimeRange: true });
-                });
+                if (!dateGroup) {
+                    dateGroup = document.createElement('div');
+                    dateGroup.className = 'date-group pending';
+                    dateGroup.dataset.date = date;
+                    completedDateGroupNodes.set(date, dateGroup);
+                    
+                    if (completedGroupObserver) {
+                        completedGroupObserver.observe(dateGroup);
+                    } else {
+                        hydrateCompletedDateGroup(dateGroup, eventsByDate[date]);
+                    }
+                } else if (!dateGroup.classList.contains('pending')) {
+                    reconcileCompletedEventsList(dateGroup.querySelector('.events-list'), eventsByDate[date]);
+                }
                 
-                dateGroup.appendChild(eventsList);
-                completedGrid.appendChild(dateGroup);
+                if (previous.nextSibling !== dateGroup) {
+                    completedGrid.insertBefore(dateGroup, previous.nextSibling);
+                }
+                previous = dateGroup;
             });
         })
         .catch(error => {
@@ -1674,6 +2137,54 @@ function renderCompletedView() {
         });
 }
 
+// 按事件ID增量更新已完成视图中某个日期分组的事件列表
+function reconcileCompletedEventsList(eventsList, events) {
+    const existingItems = new Map();
+    eventsList.querySelectorAll('.event-item').forEach(item => {
+        existingItems.set(item.dataset.eventId, item);
+    });
+    
+    let previous = null;
+    events.forEach(event => {
+        const key = String(event.id);
+        let item = existingItems.get(key);
+        existingItems.delete(key);
+        
+        if (!item) {
+            item = renderEventItem(event, eventsList, { showTimeRange: true });
+        }
+        
+        const expected = previous ? previous.nextSibling : eventsList.firstChild;
+        if (item !== expected) {
+            eventsList.insertBefore(item, expected);
+        }
+        previous = item;
+    });
+    
+    // 移除已不存在的事件
+    existingItems.forEach(item => item.remove());
+}
+
+// 为已完成视图中的日期分组生成标题和事件列表
+function hydrateCompletedDateGroup(dateGroup, events) {
+    const date = dateGroup.dataset.date;
+    
+    // 创建日期标题
+    const dateHeader = document.createElement('h3');
+    dateHeader.textContent = dateHeading(date);
+    
+    // 创建事件列表
+    const eventsList = document.createElement('div');
+    eventsList.className = 'events-list';
+    events.forEach(event => {
+        renderEventItem(event, eventsList, { showTimeRange: true });
+    });
+    
+    dateGroup.appendChild(dateHeader);
+    dateGroup.appendChild(eventsList);
+    dateGroup.classList.remove('pending');
+}
+
 // 清空完成任务表单
 function clearCompleteTaskForm() {
     document.getElementById('actual-start-time').value = '';
@@ -1683,21 +2194,16 @@ function clearCompleteTaskForm() {
 }
 
 // 标记事件为已完成
-function markEventCompleted(eventId, eventDate) {
-    // 如果该事件正在处理中，则忽略请求
-    if (processingEvents.has(eventId)) {
-        console.log(`事件 ${eventId} 正在处理中，忽略重复请求`);
+function markEventCompleted(event) {
+    // 如果该事件正在处理中或已经完成，则忽略请求
+    if (event._status) {
+        console.log(`事件 ${event.id} 正在处理或已经处理完成，忽略重复请求`);
         return;
     }
 
-    // 将事件ID添加到处理集合中
-    processingEvents.add(eventId);
-
-    // 保存当前正在完成的事件信息
-    currentCompletingEvent = {
-        id: eventId,
-        date: eventDate
-    };
+    // 标记为正在处理，并保存当前正在完成的事件
+    event._status = 'processing';
+    currentCompletingEvent = event;
 
     // 设置默认的开始时间为当前时间
     const now = new Date();
@@ -1749,8 +2255,9 @@ function submitCompleteTask() {
         actual_time_range: actualTimeRange
     };
 
-    // 发送完成请求
-    fetch(`/api/events/${currentCompletingEvent.id}/complete`, {
+    // 发送完成请求；对话框可能在请求期间被关闭，回调中使用发起请求时的事件
+    const completingEvent = currentCompletingEvent;
+    fetch(`/api/events/${completingEvent.id}/complete`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -1758,19 +2265,18 @@ function submitCompleteTask() {
         body: JSON.stringify(requestData)
     })
     .then(response => {
-        console.log(`事件 ${currentCompletingEvent.id} 的完成请求已发送，状态码: ${response.status}`);
+        console.log(`事件 ${completingEvent.id} 的完成请求已发送，状态码: ${response.status}`);
         return response.json();
     })
     .then(data => {
-        // 从处理集合中移除事件ID
-        processingEvents.delete(currentCompletingEvent.id);
-
         if (data.status === 'success') {
+            invalidateEventsCache();
+
             // 显示成功消息
             showNotification('任务已标记为完成');
 
-            // 将事件ID添加到已完成集合中
-            completedEvents.add(currentCompletingEvent.id);
+            // 标记为已完成，防止重复提交
+            completingEvent._status = 'completed';
 
             // 隐藏对话框
             document.getElementById('complete-task-dialog').classList.add('hidden');
@@ -1790,18 +2296,16 @@ function submitCompleteTask() {
                 }
             }, 500);
         } else {
-            // 处理失败，从已处理完成集合中移除事件ID
-            completedEvents.delete(currentCompletingEvent.id);
+            // 处理失败，恢复空闲状态
+            delete completingEvent._status;
             alert('标记任务完成失败: ' + data.message);
         }
     })
     .catch(error => {
-        // 从处理集合中移除事件ID
-        processingEvents.delete(currentCompletingEvent.id);
-        // 处理失败，从已处理完成集合中移除事件ID
-        completedEvents.delete(currentCompletingEvent.id);
+        // 处理失败，恢复空闲状态
+        delete completingEvent._status;
 
-        console.error(`事件 ${currentCompletingEvent.id} 标记完成出错:`, error);
+        console.error(`事件 ${completingEvent.id} 标记完成出错:`, error);
         alert('标记任务完成时发生错误');
     })
     .finally(() => {
@@ -1869,27 +2373,15 @@ function renderTimeReviewView() {
                 // 创建日期标题
                 const dateHeader = document.createElement('div');
                 dateHeader.className = 'time-review-day-header';
-                const dateObj = parseDate(date);
-                dateHeader.textContent = `${date} ${['周日', '周一', '周二', '周三', '周四', '周五', '周六'][dateObj.getDay()]}`;
+                dateHeader.textContent = dateHeading(date);
                 dayGroup.appendChild(dateHeader);
                 
                 // 创建事件列表
                 const eventsList = document.createElement('div');
                 eventsList.className = 'time-review-events';
                 
-                // 按时间排序
-                eventsByDate[date].sort((a, b) => {
-                    // 提取开始时间
-                    const getStartTime = (timeRange) => {
-                        const parts = timeRange.split('-');
-                        return parts[0].trim();
-                    };
-                    
-                    const aStart = getStartTime(a.time_range);
-                    const bStart = getStartTime(b.time_range);
-                    
-                    return aStart.localeCompare(bStart);
-                });
+                // 按开始时间排序
+                eventsByDate[date].sort((a, b) => reviewTimeRange(a.time_range).startMinutes - reviewTimeRange(b.time_range).startMinutes);
                 
                 // 添加事件
                 eventsByDate[date].forEach(event => {
@@ -1906,22 +2398,8 @@ function renderTimeReviewView() {
                     const contentDiv = document.createElement('div');
                     contentDiv.className = 'time-review-event-content';
                     
-                    // 解析时间范围
-                    const parseTimeRange = (timeRange) => {
-                        const [start, end] = timeRange.split('-').map(t => t.trim());
-                        const [startHour, startMin] = start.split(':').map(Number);
-                        const [endHour, endMin] = end.split(':').map(Number);
-                        return {
-                            start: { hour: startHour, minute: startMin },
-                            end: { hour: endHour, minute: endMin },
-                            startMinutes: startHour * 60 + startMin,
-                            endMinutes: endHour * 60 + endMin,
-                            durationMinutes: (endHour * 60 + endMin) - (startHour * 60 + startMin)
-                        };
-                    };
-                    
-                    const plannedTime = parseTimeRange(event.time_range);
-                    const actualTime = parseTimeRange(event.actual_time_range);
+                    const plannedTime = reviewTimeRange(event.time_range);
+                    const actualTime = reviewTimeRange(event.actual_time_range);
                     
                     // 计算时间轴的起始和结束时间（取两者的最小和最大值）
                     const minStartMinutes = Math.min(plannedTime.startMinutes, actualTime.startMinutes);
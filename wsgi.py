@@ -0,0 +1,15 @@
+"""
+使用gevent协程运行日程表可视化服务的WSGI入口
+
+必须在导入应用之前完成猴子补丁，使socket、线程本地存储等标准库在协程间协作，
+LLM查询等待网络响应时会让出执行权，一个工作进程即可同时处理大量请求。
+
+使用方法：
+    pip install gunicorn gevent
+    gunicorn -c gunicorn_conf.py -k gevent wsgi:app
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+from schedule_visualizer import app  # noqa: E402